@@ -2,7 +2,7 @@ import os
 from dotenv import load_dotenv
 import pyupbit
 import pandas as pd
-import json
+import orjson
 from openai import OpenAI
 import ta
 from ta.utils import dropna
@@ -61,9 +61,22 @@ def init_db():
                   btc_avg_buy_price REAL,
                   btc_krw_price REAL,
                   reflection TEXT)''')
+    # 최근 거래 조회(WHERE timestamp > ? ORDER BY timestamp DESC)용 인덱스 - cli_db_manager와 같은 이름
+    c.execute("CREATE INDEX IF NOT EXISTS idx_trades_ts ON trades(timestamp DESC)")
+    # WAL은 DB 파일에 유지되므로 초기화 시 한 번만 설정 (대시보드/CLI 읽기가 기록을 막지 않음)
+    c.execute("PRAGMA journal_mode=WAL")
     conn.commit()
     return conn
 
+# 스케줄러 프로세스가 살아 있는 동안 재사용하는 DB 연결 (실행마다 새로 열지 않음)
+_db_conn = None
+
+def get_db():
+    global _db_conn
+    if _db_conn is None:
+        _db_conn = init_db()
+    return _db_conn
+
 # 거래 기록을 DB에 저장하는 함수
 def log_trade(conn, decision, percentage, reason, btc_balance, krw_balance, btc_avg_buy_price, btc_krw_price, reflection=''):
     c = conn.cursor()
@@ -151,24 +164,32 @@ def add_indicators(df):
     df['rsi'] = ta.momentum.RSIIndicator(close=df['close'], window=14).rsi()
     
     # MACD (Moving Average Convergence Divergence) 추가
-    macd = ta.trend.MACD(close=df['close'])
-    df['macd'] = macd.macd()
-    df['macd_signal'] = macd.macd_signal()
-    df['macd_diff'] = macd.macd_diff()
+    # EMA12/EMA26을 한 번씩만 계산해 MACD와 이동평균선에 함께 사용 (ta.trend.MACD와 동일한 방식)
+    ema_12 = df['close'].ewm(span=12, min_periods=12, adjust=False).mean()
+    ema_26 = df['close'].ewm(span=26, min_periods=26, adjust=False).mean()
+    df['macd'] = ema_12 - ema_26
+    df['macd_signal'] = df['macd'].ewm(span=9, min_periods=9, adjust=False).mean()
+    df['macd_diff'] = df['macd'] - df['macd_signal']
     
-    # 이동평균선 (단기, 장기)
-    df['sma_20'] = ta.trend.SMAIndicator(close=df['close'], window=20).sma_indicator()
-    df['ema_12'] = ta.trend.EMAIndicator(close=df['close'], window=12).ema_indicator()
+    # 이동평균선 (단기, 장기) - SMA20은 볼린저 밴드 중심선과 같은 값
+    df['sma_20'] = df['bb_bbm']
+    df['ema_12'] = ema_12
     
     return df
 
+# 프롬프트용 OHLCV 직렬화 (행마다 dict를 만들지 않고 CSV 문자열로 한 번에 변환)
+def format_ohlcv_for_prompt(df, rows=None):
+    if rows:
+        df = df.tail(rows)
+    return df.to_csv()
+
 # 공포 탐욕 지수 조회
 def get_fear_and_greed_index():
     url = "https://api.alternative.me/fng/"
     try:
         response = requests.get(url, timeout=10)
         response.raise_for_status()
-        data = response.json()
+        data = orjson.loads(response.content)
         return data['data'][0]
     except requests.exceptions.RequestException as e:
         logger.error(f"Error fetching Fear and Greed Index: {e}")
@@ -190,7 +211,7 @@ def get_bitcoin_news():
     try:
         response = requests.get(url, params=params)
         response.raise_for_status()
-        data = response.json()
+        data = orjson.loads(response.content)
         
         news_results = data.get("news_results", [])
         headlines = []
@@ -262,12 +283,23 @@ def click_element_by_xpath(driver, xpath, element_name, wait_time=10):
         logger.error(f"{element_name} 요소를 찾을 수 없습니다.")
     except Exception as e:
         logger.error(f"{element_name} 클릭 중 오류 발생: {e}")
+# 차트 로딩 대기 - 고정 sleep 대신 차트 메뉴가 나타나는 즉시 진행
+CHART_READY_XPATH = "/html/body/div[1]/div[2]/div[3]/span/div/div/div[1]/div/div/cq-menu[1]"
+
+def wait_for_chart_ready(driver, timeout=30, poll_frequency=0.2):
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=poll_frequency).until(
+            EC.presence_of_element_located((By.XPATH, CHART_READY_XPATH))
+        )
+        logger.info("차트 로딩 완료")
+    except TimeoutException:
+        logger.warning(f"차트 로딩 대기 시간({timeout}초)이 초과되었습니다. 계속 진행합니다.")
 # 차트 클릭하기
 def perform_chart_actions(driver):
     # 시간 메뉴 클릭
     click_element_by_xpath(
         driver,
-        "/html/body/div[1]/div[2]/div[3]/span/div/div/div[1]/div/div/cq-menu[1]",
+        CHART_READY_XPATH,
         "시간 메뉴"
     )
     # 1시간 옵션 선택
@@ -345,7 +377,7 @@ def ai_trading():
         driver = create_driver()
         driver.get("https://upbit.com/full_chart?code=CRIX.UPBIT.KRW-BTC")
         logger.info("페이지 로드 완료")
-        time.sleep(30)  # 페이지 로딩 대기 시간 증가
+        wait_for_chart_ready(driver)
         logger.info("차트 작업 시작")
         perform_chart_actions(driver)
         logger.info("차트 작업 완료")
@@ -367,8 +399,8 @@ def ai_trading():
         logger.error("OpenAI API key is missing or invalid.")
         return None
     try:
-        # 데이터베이스 연결
-        with sqlite3.connect('bitcoin_trades.db') as conn:
+        # 데이터베이스 연결 (with 블록은 트랜잭션 범위일 뿐 연결은 닫지 않음)
+        with get_db() as conn:
             # 최근 거래 내역 가져오기
             recent_trades = get_recent_trades(conn)
             
@@ -377,8 +409,8 @@ def ai_trading():
                 "fear_greed_index": fear_greed_index,
                 "news_headlines": news_headlines,
                 "orderbook": orderbook,
-                "daily_ohlcv": df_daily.to_dict(),
-                "hourly_ohlcv": df_hourly.to_dict()
+                "daily_ohlcv": format_ohlcv_for_prompt(df_daily),
+                "hourly_ohlcv": format_ohlcv_for_prompt(df_hourly)
             }
             
             # 반성 및 개선 내용 생성
@@ -423,12 +455,12 @@ def ai_trading():
                         "content": [
                             {
                                 "type": "text",
-                                "text": f"""Current investment status: {json.dumps(filtered_balances)}
-                Orderbook: {json.dumps(orderbook)}
-                Daily OHLCV with indicators (30 days): {df_daily.to_json()}
-                Hourly OHLCV with indicators (24 hours): {df_hourly.to_json()}
-                Recent news headlines: {json.dumps(news_headlines)}
-                Fear and Greed Index: {json.dumps(fear_greed_index)}"""
+                                "text": f"""Current investment status: {orjson.dumps(filtered_balances).decode()}
+                Orderbook: {orjson.dumps(orderbook).decode()}
+                Daily OHLCV with indicators (30 days, CSV): {format_ohlcv_for_prompt(df_daily)}
+                Hourly OHLCV with indicators (24 hours, CSV): {format_ohlcv_for_prompt(df_hourly)}
+                Recent news headlines: {orjson.dumps(news_headlines).decode()}
+                Fear and Greed Index: {orjson.dumps(fear_greed_index).decode()}"""
                             },
                             {
                                 "type": "image_url",
@@ -526,8 +558,8 @@ def ai_trading():
         return
 
 if __name__ == "__main__":
-    # 데이터베이스 초기화
-    init_db()
+    # 데이터베이스 초기화 (연결은 이후 매매 실행에서 재사용)
+    get_db()
 
     # 중복 실행 방지를 위한 변수
     trading_in_progress = False
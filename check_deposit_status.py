@@ -5,7 +5,8 @@ def check_recent_deposits():
     """최근 입금 내역 및 데이터베이스 상태 확인"""
     
     try:
-        conn = sqlite3.connect('bitcoin_trades.db')
+        # 조회만 하므로 읽기 전용으로 열기 (DB 파일이 없으면 빈 파일을 만들지 않고 오류)
+        conn = sqlite3.connect('file:bitcoin_trades.db?mode=ro', uri=True)
         cursor = conn.cursor()
         
         print("=" * 60)
@@ -76,13 +77,15 @@ def check_recent_deposits():
         
         # 4. 데이터베이스 무결성 확인
         print(f"\n🔧 데이터베이스 상태:")
-        cursor.execute("SELECT COUNT(*) FROM trades")
-        total_count = cursor.fetchone()[0]
+        # 한 번에 조회 (MIN/MAX는 각각 서브쿼리로 두어야 timestamp 인덱스의 양 끝만 읽음)
+        cursor.execute("""
+            SELECT (SELECT COUNT(*) FROM trades),
+                   (SELECT MIN(timestamp) FROM trades),
+                   (SELECT MAX(timestamp) FROM trades)
+        """)
+        total_count, first_ts, last_ts = cursor.fetchone()
         print(f"   총 거래 수: {total_count}개")
-        
-        cursor.execute("SELECT MIN(timestamp), MAX(timestamp) FROM trades")
-        date_range = cursor.fetchone()
-        print(f"   기간: {date_range[0]} ~ {date_range[1]}")
+        print(f"   기간: {first_ts} ~ {last_ts}")
         
         # 5. 권장 조치
         print(f"\n💡 권장 조치:")
@@ -102,7 +105,8 @@ def check_recent_deposits():
 def check_database_health():
     """데이터베이스 건강성 검사"""
     try:
-        conn = sqlite3.connect('bitcoin_trades.db')
+        # 조회만 하므로 읽기 전용으로 열기 (DB 파일이 없으면 빈 파일을 만들지 않고 오류)
+        conn = sqlite3.connect('file:bitcoin_trades.db?mode=ro', uri=True)
         cursor = conn.cursor()
         
         print(f"\n🏥 데이터베이스 건강성 검사:")
@@ -5,29 +5,110 @@ AWS EC2에서 CLI로 데이터베이스를 관리하는 도구
 """
 
 import sqlite3
-import pandas as pd
-from datetime import datetime
+from datetime import datetime, timedelta
 import argparse
 import sys
 import json
 from tabulate import tabulate
 
+# 연결 직후 한 번 적용하는 SQLite 설정
+CONNECTION_PRAGMAS = """
+    PRAGMA journal_mode=WAL;
+    PRAGMA synchronous=NORMAL;
+    PRAGMA temp_store=MEMORY;
+    PRAGMA mmap_size=268435456;
+    PRAGMA cache_size=-20000;
+"""
+
+# 조회/검색용 인덱스
+INDEX_STATEMENTS = (
+    "CREATE INDEX IF NOT EXISTS idx_trades_type_ts ON trades(transaction_type, timestamp DESC)",
+    "CREATE INDEX IF NOT EXISTS idx_trades_ts ON trades(timestamp DESC)",
+)
+
+# reason/notes 부분 문자열 검색용 FTS5(trigram) 테이블과 동기화 트리거
+FTS_STATEMENTS = """
+    CREATE VIRTUAL TABLE trades_fts USING fts5(
+        reason, notes, content='trades', content_rowid='id', tokenize='trigram'
+    );
+    CREATE TRIGGER IF NOT EXISTS trades_fts_ai AFTER INSERT ON trades BEGIN
+        INSERT INTO trades_fts(rowid, reason, notes) VALUES (new.id, new.reason, new.notes);
+    END;
+    CREATE TRIGGER IF NOT EXISTS trades_fts_ad AFTER DELETE ON trades BEGIN
+        INSERT INTO trades_fts(trades_fts, rowid, reason, notes) VALUES ('delete', old.id, old.reason, old.notes);
+    END;
+    CREATE TRIGGER IF NOT EXISTS trades_fts_au AFTER UPDATE OF reason, notes ON trades BEGIN
+        INSERT INTO trades_fts(trades_fts, rowid, reason, notes) VALUES ('delete', old.id, old.reason, old.notes);
+        INSERT INTO trades_fts(rowid, reason, notes) VALUES (new.id, new.reason, new.notes);
+    END;
+    INSERT INTO trades_fts(trades_fts) VALUES ('rebuild');
+"""
+
+# trigram 토크나이저는 3글자 이상만 검색 가능
+FTS_MIN_KEYWORD_LENGTH = 3
+
+# 검색 결과를 나눠서 출력할 단위
+SEARCH_CHUNK_SIZE = 200
+
+# 목록 출력용 시간 포맷 (월-일 시:분)
+# ISO 형식(YYYY-MM-DDTHH:MM...)은 자리가 고정이므로 파싱 없이 잘라서 사용
+def format_timestamp(ts):
+    if isinstance(ts, str) and len(ts) >= 16 and ts[4] == '-' and ts[13] == ':':
+        return f"{ts[5:10]} {ts[11:16]}"
+    try:
+        return datetime.fromisoformat(ts).strftime('%m-%d %H:%M')
+    except (TypeError, ValueError):
+        return ts
+
+# trades 스키마 버전 (컬럼/인덱스를 추가하면 올릴 것)
+SCHEMA_VERSION = 1
+
+# 스키마 확인이 끝난 DB 경로 (같은 프로세스에서 반복 확인하지 않도록)
+_schema_checked = set()
+
 class CLIDBManager:
     def __init__(self, db_path='bitcoin_trades.db'):
         self.db_path = db_path
-        self.ensure_columns()
+        self._conn = None
+        if db_path not in _schema_checked:
+            self.ensure_columns()
+            _schema_checked.add(db_path)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def __del__(self):
+        self.close()
     
     def get_connection(self):
-        return sqlite3.connect(self.db_path)
+        """연결을 한 번만 열고 재사용"""
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.db_path)
+            self._conn.executescript(CONNECTION_PRAGMAS)
+        return self._conn
+    
+    def close(self):
+        """연결 닫기"""
+        if getattr(self, '_conn', None) is not None:
+            self._conn.close()
+            self._conn = None
     
     def ensure_columns(self):
         """필요한 컬럼들이 존재하는지 확인하고 없으면 추가"""
         conn = self.get_connection()
         c = conn.cursor()
         
+        # 이미 현재 스키마 버전이면 확인 생략
+        c.execute("PRAGMA user_version")
+        if c.fetchone()[0] >= SCHEMA_VERSION:
+            return
+        
         # 기존 컬럼 확인
         c.execute("PRAGMA table_info(trades)")
-        existing_columns = [col[1] for col in c.fetchall()]
+        existing_columns = {col[1] for col in c.fetchall()}
         
         # 필요한 컬럼들 추가
         new_columns = [
@@ -36,38 +117,66 @@ class CLIDBManager:
             ('notes', 'TEXT')
         ]
         
-        for col_name, col_def in new_columns:
-            if col_name not in existing_columns:
-                try:
-                    c.execute(f'ALTER TABLE trades ADD COLUMN {col_name} {col_def}')
-                    print(f"✅ {col_name} 컬럼 추가됨")
-                except sqlite3.OperationalError:
-                    pass  # 이미 존재하면 무시
-        
-        conn.commit()
-        conn.close()
+        if not existing_columns:
+            return  # trades 테이블이 아직 없음
+        
+        # 컬럼 추가와 인덱스 생성을 한 트랜잭션으로 커밋
+        with conn:
+            c.execute("BEGIN IMMEDIATE")
+            for col_name, col_def in new_columns:
+                if col_name not in existing_columns:
+                    try:
+                        c.execute(f'ALTER TABLE trades ADD COLUMN {col_name} {col_def}')
+                        print(f"✅ {col_name} 컬럼 추가됨")
+                    except sqlite3.OperationalError:
+                        pass  # 이미 존재하면 무시
+            
+            for statement in INDEX_STATEMENTS:
+                c.execute(statement)
+        
+        # 검색용 FTS 테이블 생성 (처음 한 번만 기존 데이터로 채움)
+        if not self.has_fts():
+            try:
+                conn.executescript(f"BEGIN; {FTS_STATEMENTS} COMMIT;")
+                print("✅ 검색 인덱스(trades_fts) 생성됨")
+            except sqlite3.OperationalError as e:
+                conn.rollback()
+                print(f"⚠️ 검색 인덱스를 만들 수 없어 LIKE 검색을 사용합니다: {e}")
+        
+        # 마이그레이션 완료 표시
+        c.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    
+    def has_fts(self):
+        """검색용 FTS 테이블 존재 여부"""
+        row = self.get_connection().execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'trades_fts'"
+        ).fetchone()
+        return row is not None
     
-    def view_trades(self, limit=20, transaction_type=None, trade_id=None):
+    def view_trades(self, limit=20, transaction_type=None, trade_id=None, before_id=None):
         """거래 내역 조회"""
         conn = self.get_connection()
         
         if trade_id:
             # 특정 ID 조회
-            query = "SELECT * FROM trades WHERE id = ?"
-            params = [trade_id]
-            df = pd.read_sql_query(query, conn, params=params)
+            cursor = conn.cursor()
+            cursor.row_factory = sqlite3.Row
+            cursor.execute("""
+                SELECT timestamp, transaction_type, decision, percentage, btc_balance, krw_balance,
+                       btc_avg_buy_price, btc_krw_price, reason, notes, reflection, manual_entry
+                FROM trades WHERE id = ?
+            """, (trade_id,))
+            trade = cursor.fetchone()
             
-            if df.empty:
+            if trade is None:
                 print(f"❌ ID {trade_id}에 해당하는 거래를 찾을 수 없습니다.")
-                conn.close()
                 return
             
             # 상세 정보 출력
-            trade = df.iloc[0]
             print(f"\n🔍 거래 상세 정보 (ID: {trade_id})")
             print("=" * 60)
             print(f"시간: {trade['timestamp']}")
-            print(f"거래 유형: {trade.get('transaction_type', 'trade')}")
+            print(f"거래 유형: {trade['transaction_type'] or 'trade'}")
             print(f"결정: {trade['decision']}")
             print(f"비율: {trade['percentage']}%")
             print(f"BTC 잔고: {trade['btc_balance']:.8f}")
@@ -75,46 +184,57 @@ class CLIDBManager:
             print(f"BTC 평균 매수가: {trade['btc_avg_buy_price']:,.0f}원")
             print(f"BTC 현재가: {trade['btc_krw_price']:,.0f}원")
             print(f"이유: {trade['reason']}")
-            if trade.get('notes'):
+            if trade['notes']:
                 print(f"메모: {trade['notes']}")
-            if trade.get('reflection'):
+            if trade['reflection']:
                 print(f"반성: {trade['reflection']}")
-            print(f"수동 입력: {'예' if trade.get('manual_entry') else '아니오'}")
+            print(f"수동 입력: {'예' if trade['manual_entry'] else '아니오'}")
             
         else:
             # 일반 조회
+            # id 기준 키셋 페이지네이션 (before_id보다 작은 id부터 최신순)
             query = "SELECT id, timestamp, transaction_type, decision, percentage, btc_balance, krw_balance, reason FROM trades"
+            conditions = []
             params = []
             
+            if before_id:
+                conditions.append("id < ?")
+                params.append(before_id)
+            
             if transaction_type:
-                query += " WHERE transaction_type = ?"
+                conditions.append("transaction_type = ?")
                 params.append(transaction_type)
             
-            query += " ORDER BY timestamp DESC"
+            if conditions:
+                query += " WHERE " + " AND ".join(conditions)
+            
+            query += " ORDER BY id DESC"
             
             if limit:
-                query += f" LIMIT {limit}"
+                query += " LIMIT ?"
+                params.append(limit)
             
-            df = pd.read_sql_query(query, conn, params=params)
+            cursor = conn.execute(query, params)
+            headers = [col[0] for col in cursor.description]
             
-            if df.empty:
+            # timestamp, 잔고 포맷팅
+            rows = [
+                [id_val, format_timestamp(ts), trans_type, decision, percentage,
+                 f"{btc_balance:.6f}", f"{krw_balance:,.0f}", reason]
+                for id_val, ts, trans_type, decision, percentage, btc_balance, krw_balance, reason in cursor
+            ]
+            
+            if not rows:
                 print("📭 거래 내역이 없습니다.")
-                conn.close()
                 return
             
-            # timestamp 포맷팅
-            df['timestamp'] = pd.to_datetime(df['timestamp']).dt.strftime('%m-%d %H:%M')
-            
-            # 잔고 포맷팅
-            df['btc_balance'] = df['btc_balance'].apply(lambda x: f"{x:.6f}")
-            df['krw_balance'] = df['krw_balance'].apply(lambda x: f"{x:,.0f}")
-            
             # 테이블 출력
-            print(f"\n📊 거래 내역 (최근 {len(df)}건)")
+            print(f"\n📊 거래 내역 (최근 {len(rows)}건)")
             print("=" * 100)
-            print(tabulate(df, headers=df.columns, tablefmt='grid', showindex=False))
-        
-        conn.close()
+            print(tabulate(rows, headers=headers, tablefmt='grid'))
+            
+            if limit and len(rows) == limit:
+                print(f"\n➡️  다음 페이지: --before-id {rows[-1][0]}")
     
     def add_deposit(self, amount, description="Manual deposit"):
         """입금 추가"""
@@ -122,12 +242,11 @@ class CLIDBManager:
         c = conn.cursor()
         
         # 최신 거래 정보 가져오기
-        c.execute("SELECT btc_balance, krw_balance, btc_avg_buy_price, btc_krw_price FROM trades ORDER BY timestamp DESC LIMIT 1")
+        c.execute("SELECT btc_balance, krw_balance, btc_avg_buy_price, btc_krw_price FROM trades WHERE id = (SELECT MAX(id) FROM trades)")
         latest = c.fetchone()
         
         if not latest:
             print("❌ 기존 거래 내역이 없습니다.")
-            conn.close()
             return False
         
         timestamp = datetime.now().isoformat()
@@ -142,27 +261,61 @@ class CLIDBManager:
                    'deposit', 1, description))
         
         conn.commit()
-        conn.close()
         print(f"✅ {amount:,}원 입금 내역이 추가되었습니다.")
         return True
     
+    def add_deposits(self, entries):
+        """여러 건의 입금을 한 번에 추가 (entries: [(금액, 설명), ...])"""
+        if not entries:
+            print("📭 추가할 입금 내역이 없습니다.")
+            return False
+        
+        conn = self.get_connection()
+        
+        with conn:
+            c = conn.cursor()
+            c.execute("BEGIN IMMEDIATE")
+            
+            # 최신 거래 정보는 한 번만 가져오고 잔고는 Python에서 누적
+            c.execute("SELECT btc_balance, krw_balance, btc_avg_buy_price, btc_krw_price FROM trades WHERE id = (SELECT MAX(id) FROM trades)")
+            latest = c.fetchone()
+            
+            if not latest:
+                print("❌ 기존 거래 내역이 없습니다.")
+                return False
+            
+            new_krw_balance = latest[1]
+            rows = []
+            for amount, description in entries:
+                new_krw_balance += amount
+                rows.append((datetime.now().isoformat(), 'hold', 0, f'Manual deposit: {description}',
+                             latest[0], new_krw_balance, latest[2], latest[3],
+                             'deposit', 1, description))
+            
+            c.executemany("""INSERT INTO trades 
+                             (timestamp, decision, percentage, reason, btc_balance, krw_balance, 
+                              btc_avg_buy_price, btc_krw_price, transaction_type, manual_entry, notes) 
+                             VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""", rows)
+        
+        total = sum(amount for amount, _ in entries)
+        print(f"✅ {len(rows)}건, 총 {total:,}원 입금 내역이 추가되었습니다.")
+        return True
+    
     def add_withdrawal(self, amount, description="Manual withdrawal"):
         """출금 추가"""
         conn = self.get_connection()
         c = conn.cursor()
         
         # 최신 거래 정보 가져오기
-        c.execute("SELECT btc_balance, krw_balance, btc_avg_buy_price, btc_krw_price FROM trades ORDER BY timestamp DESC LIMIT 1")
+        c.execute("SELECT btc_balance, krw_balance, btc_avg_buy_price, btc_krw_price FROM trades WHERE id = (SELECT MAX(id) FROM trades)")
         latest = c.fetchone()
         
         if not latest:
             print("❌ 기존 거래 내역이 없습니다.")
-            conn.close()
             return False
         
         if latest[1] < amount:
             print(f"❌ 잔고 부족: 현재 {latest[1]:,}원, 출금 요청 {amount:,}원")
-            conn.close()
             return False
         
         timestamp = datetime.now().isoformat()
@@ -177,7 +330,6 @@ class CLIDBManager:
                    'withdrawal', 1, description))
         
         conn.commit()
-        conn.close()
         print(f"✅ {amount:,}원 출금 내역이 추가되었습니다.")
         return True
     
@@ -192,7 +344,6 @@ class CLIDBManager:
         
         if not trade:
             print(f"❌ ID {trade_id}에 해당하는 거래를 찾을 수 없습니다.")
-            conn.close()
             return False
         
         print(f"삭제할 거래: ID {trade_id} | {trade[0]} | {trade[1]} | {trade[2]}")
@@ -201,12 +352,10 @@ class CLIDBManager:
             confirm = input("정말 삭제하시겠습니까? (y/N): ")
             if confirm.lower() != 'y':
                 print("❌ 삭제가 취소되었습니다.")
-                conn.close()
                 return False
         
         c.execute("DELETE FROM trades WHERE id = ?", (trade_id,))
         conn.commit()
-        conn.close()
         print(f"✅ ID {trade_id} 거래가 삭제되었습니다.")
         return True
     
@@ -231,19 +380,18 @@ class CLIDBManager:
             print(f"❌ ID {trade_id}에 해당하는 거래를 찾을 수 없습니다.")
             result = False
         
-        conn.close()
         return result
     
     def summary(self):
         """요약 정보"""
         conn = self.get_connection()
         
-        # 전체 통계
+        # 거래 기간 (MIN/MAX를 각각 서브쿼리로 두어야 timestamp 인덱스의 양 끝만 읽음)
         c = conn.cursor()
-        c.execute("SELECT COUNT(*) FROM trades")
-        total_trades = c.fetchone()[0]
+        c.execute("SELECT (SELECT MIN(timestamp) FROM trades), (SELECT MAX(timestamp) FROM trades)")
+        first_ts, last_ts = c.fetchone()
         
-        # 거래 유형별 통계
+        # 거래 유형별 통계 (전체 거래 수는 유형별 건수 합으로 계산)
         c.execute("""
             SELECT transaction_type, COUNT(*) as count 
             FROM trades 
@@ -251,16 +399,17 @@ class CLIDBManager:
             ORDER BY count DESC
         """)
         type_stats = c.fetchall()
+        total_trades = sum(count for _, count in type_stats)
         
         # 최신 잔고
-        c.execute("SELECT btc_balance, krw_balance, btc_krw_price FROM trades ORDER BY timestamp DESC LIMIT 1")
+        c.execute("SELECT btc_balance, krw_balance, btc_krw_price FROM trades WHERE id = (SELECT MAX(id) FROM trades)")
         latest = c.fetchone()
         
-        conn.close()
-        
         print(f"\n📈 거래 요약")
         print("=" * 50)
         print(f"총 거래 수: {total_trades}건")
+        if first_ts:
+            print(f"기간: {first_ts} ~ {last_ts}")
         
         if latest:
             total_asset = latest[0] * latest[2] + latest[1]
@@ -276,25 +425,52 @@ class CLIDBManager:
         """키워드로 검색"""
         conn = self.get_connection()
         
-        query = """
-            SELECT id, timestamp, transaction_type, decision, reason 
-            FROM trades 
-            WHERE reason LIKE ? OR notes LIKE ?
-            ORDER BY timestamp DESC
-        """
-        
-        df = pd.read_sql_query(query, conn, params=[f"%{keyword}%", f"%{keyword}%"])
-        conn.close()
-        
-        if df.empty:
+        if len(keyword) >= FTS_MIN_KEYWORD_LENGTH and self.has_fts():
+            # FTS 인덱스로 검색 (키워드 전체를 하나의 구문으로 검색)
+            query = """
+                SELECT id, timestamp, transaction_type, decision, reason 
+                FROM trades 
+                WHERE id IN (SELECT rowid FROM trades_fts WHERE trades_fts MATCH ?)
+                ORDER BY timestamp DESC
+            """
+            params = ['"' + keyword.replace('"', '""') + '"']
+        else:
+            query = """
+                SELECT id, timestamp, transaction_type, decision, reason 
+                FROM trades 
+                WHERE reason LIKE ? OR notes LIKE ?
+                ORDER BY timestamp DESC
+            """
+            params = [f"%{keyword}%", f"%{keyword}%"]
+        
+        cursor = conn.cursor()
+        cursor.row_factory = sqlite3.Row
+        cursor.execute(query, params)
+        headers = [col[0] for col in cursor.description]
+        
+        # 결과를 한 번에 모으지 않고 SEARCH_CHUNK_SIZE건씩 바로 출력
+        total = 0
+        while True:
+            chunk = cursor.fetchmany(SEARCH_CHUNK_SIZE)
+            if not chunk:
+                break
+            
+            if total == 0:
+                print(f"\n🔍 '{keyword}' 검색 결과")
+                print("=" * 80)
+            
+            rows = [
+                [row['id'], format_timestamp(row['timestamp']), row['transaction_type'], row['decision'], row['reason']]
+                for row in chunk
+            ]
+            print(tabulate(rows, headers=headers if total == 0 else (), tablefmt='plain'))
+            total += len(rows)
+        
+        if total == 0:
             print(f"📭 '{keyword}' 검색 결과가 없습니다.")
             return
         
-        df['timestamp'] = pd.to_datetime(df['timestamp']).dt.strftime('%m-%d %H:%M')
-        
-        print(f"\n🔍 '{keyword}' 검색 결과 ({len(df)}건)")
-        print("=" * 80)
-        print(tabulate(df, headers=df.columns, tablefmt='grid', showindex=False))
+        print(f"\n총 {total}건")
     
     def backup(self, backup_path=None):
         """데이터베이스 백업"""
@@ -302,14 +478,63 @@ class CLIDBManager:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             backup_path = f"backup_bitcoin_trades_{timestamp}.db"
         
-        import shutil
+        # SQLite 온라인 백업 API로 복사 (쓰기 중이어도 일관된 스냅샷, WAL 내용 포함)
         try:
-            shutil.copy2(self.db_path, backup_path)
+            dst = sqlite3.connect(backup_path)
+            try:
+                self.get_connection().backup(dst, pages=1024)
+            finally:
+                dst.close()
             print(f"✅ 데이터베이스가 {backup_path}로 백업되었습니다.")
             return True
         except Exception as e:
             print(f"❌ 백업 실패: {e}")
             return False
+    
+    def archive(self, days, archive_path=None, force=False):
+        """오래된 거래를 아카이브 DB로 이동 (trades 테이블은 최근 구간만 유지)"""
+        if not archive_path:
+            archive_path = self.db_path.rsplit('.', 1)[0] + '_archive.db'
+        cutoff = (datetime.now() - timedelta(days=days)).isoformat()
+        
+        conn = self.get_connection()
+        c = conn.cursor()
+        
+        # 최신 행은 잔고 기준점이므로 항상 남김
+        where = "timestamp < ? AND id < (SELECT MAX(id) FROM trades)"
+        c.execute(f"SELECT COUNT(*) FROM trades WHERE {where}", (cutoff,))
+        count = c.fetchone()[0]
+        if count == 0:
+            print(f"📭 {days}일보다 오래된 거래가 없습니다.")
+            return False
+        
+        print(f"이동할 거래: {count}건 ({cutoff[:10]} 이전) → {archive_path}")
+        if not force:
+            confirm = input("아카이브로 이동하시겠습니까? (y/N): ")
+            if confirm.lower() != 'y':
+                print("❌ 아카이브가 취소되었습니다.")
+                return False
+        
+        c.execute("ATTACH DATABASE ? AS archive", (archive_path,))
+        try:
+            # 아카이브 테이블이 없으면 같은 구조로 만들고, 이후 추가된 컬럼은 보충
+            c.execute("CREATE TABLE IF NOT EXISTS archive.trades AS SELECT * FROM main.trades WHERE 0")
+            columns = [col[1] for col in c.execute("PRAGMA main.table_info(trades)")]
+            archived = {col[1] for col in c.execute("PRAGMA archive.table_info(trades)")}
+            for col in columns:
+                if col not in archived:
+                    c.execute(f"ALTER TABLE archive.trades ADD COLUMN {col}")
+            
+            # 복사 후 삭제 (중간에 실패해도 원본이 사라지지 않도록 순서 유지)
+            col_list = ", ".join(columns)
+            with conn:
+                c.execute(f"INSERT INTO archive.trades ({col_list}) SELECT {col_list} FROM main.trades WHERE {where}", (cutoff,))
+                c.execute(f"DELETE FROM main.trades WHERE {where}", (cutoff,))
+        finally:
+            c.execute("DETACH DATABASE archive")
+        
+        print(f"✅ {count}건을 {archive_path}로 이동했습니다.")
+        return True
 
 def main():
     parser = argparse.ArgumentParser(description='Bitcoin Trading Database CLI Manager')
@@ -322,12 +547,16 @@ def main():
     view_parser.add_argument('--limit', type=int, default=20, help='Number of records to show')
     view_parser.add_argument('--type', choices=['trade', 'deposit', 'withdrawal', 'fee', 'other'], help='Filter by transaction type')
     view_parser.add_argument('--id', type=int, help='View specific trade by ID')
+    view_parser.add_argument('--before-id', type=int, help='Show trades older than this ID (next page)')
     
     # deposit 명령
     deposit_parser = subparsers.add_parser('deposit', help='Add manual deposit')
     deposit_parser.add_argument('amount', type=int, help='Deposit amount')
     deposit_parser.add_argument('--desc', default='Manual deposit', help='Description')
     
+    # deposit-bulk 명령 (stdin JSON: [{"amount": 100000, "desc": "..."}, ...])
+    subparsers.add_parser('deposit-bulk', help='Add multiple deposits from JSON on stdin')
+    
     # withdraw 명령
     withdraw_parser = subparsers.add_parser('withdraw', help='Add manual withdrawal')
     withdraw_parser.add_argument('amount', type=int, help='Withdrawal amount')
@@ -354,6 +583,12 @@ def main():
     backup_parser = subparsers.add_parser('backup', help='Backup database')
     backup_parser.add_argument('--path', help='Backup file path')
     
+    # archive 명령
+    archive_parser = subparsers.add_parser('archive', help='Move old trades to an archive database')
+    archive_parser.add_argument('--days', type=int, default=90, help='Keep trades newer than this many days')
+    archive_parser.add_argument('--path', help='Archive database path')
+    archive_parser.add_argument('--force', action='store_true', help='Archive without confirmation')
+    
     args = parser.parse_args()
     
     if not args.command:
@@ -367,34 +602,42 @@ def main():
         print(f"❌ 데이터베이스 연결 실패: {e}")
         return
     
-    # 명령 실행
-    try:
-        if args.command == 'view':
-            db_manager.view_trades(args.limit, args.type, args.id)
+    # 명령 실행 (연결은 with 블록이 끝날 때 닫힘)
+    with db_manager:
+        try:
+            if args.command == 'view':
+                db_manager.view_trades(args.limit, args.type, args.id, args.before_id)
         
-        elif args.command == 'deposit':
-            db_manager.add_deposit(args.amount, args.desc)
+            elif args.command == 'deposit':
+                db_manager.add_deposit(args.amount, args.desc)
         
-        elif args.command == 'withdraw':
-            db_manager.add_withdrawal(args.amount, args.desc)
+            elif args.command == 'deposit-bulk':
+                entries = [(int(item['amount']), item.get('desc', 'Manual deposit')) for item in json.load(sys.stdin)]
+                db_manager.add_deposits(entries)
         
-        elif args.command == 'delete':
-            db_manager.delete_trade(args.id, args.force)
+            elif args.command == 'withdraw':
+                db_manager.add_withdrawal(args.amount, args.desc)
         
-        elif args.command == 'update':
-            db_manager.update_type(args.id, args.type)
+            elif args.command == 'delete':
+                db_manager.delete_trade(args.id, args.force)
         
-        elif args.command == 'search':
-            db_manager.search(args.keyword)
+            elif args.command == 'update':
+                db_manager.update_type(args.id, args.type)
         
-        elif args.command == 'summary':
-            db_manager.summary()
+            elif args.command == 'search':
+                db_manager.search(args.keyword)
         
-        elif args.command == 'backup':
-            db_manager.backup(args.path)
+            elif args.command == 'summary':
+                db_manager.summary()
         
-    except Exception as e:
-        print(f"❌ 명령 실행 중 오류 발생: {e}")
+            elif args.command == 'backup':
+                db_manager.backup(args.path)
+        
+            elif args.command == 'archive':
+                db_manager.archive(args.days, args.path, args.force)
+        
+        except Exception as e:
+            print(f"❌ 명령 실행 중 오류 발생: {e}")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -29,8 +29,10 @@ def calculate_bollinger_bands(prices: pd.Series, period: int = 20, std: int = 2)
         current = float(prices.iloc[-1])
         return {"upper": current * 1.05, "middle": current, "lower": current * 0.95}
     
-    middle = prices.rolling(window=period).mean().iloc[-1]
-    std_dev = prices.rolling(window=period).std().iloc[-1]
+    # 마지막 구간만 필요하므로 전체 rolling 대신 마지막 period개 값으로 계산
+    window = prices.to_numpy(dtype=float)[-period:]
+    middle = window.mean()
+    std_dev = window.std(ddof=1)
     
     return {
         "upper": float(middle + std * std_dev),
@@ -43,8 +45,9 @@ def calculate_volume_ratio(volumes: pd.Series, period: int = 24) -> float:
     if len(volumes) < period:
         return 1.0
     
-    avg_volume = volumes.iloc[-period:].mean()
-    current_volume = volumes.iloc[-1]
+    values = volumes.to_numpy()
+    avg_volume = values[-period:].mean()
+    current_volume = values[-1]
     
     return float(current_volume / avg_volume) if avg_volume > 0 else 1.0
 
@@ -56,7 +59,7 @@ def calculate_indicators(ticker: str = "KRW-BTC") -> Optional[Dict]:
         if df is None or df.empty:
             return None
         
-        current_price = float(df['close'].iloc[-1])
+        current_price = float(df['close'].to_numpy()[-1])
         
         # RSI
         rsi = calculate_rsi(df['close'], 14)
@@ -1,9 +1,13 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.graph_objects as go
 import pyupbit
 import yfinance as yf
 import os
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 from datetime import datetime, timedelta, timezone
 from supabase import create_client, Client
@@ -12,6 +16,12 @@ from deep_translator import GoogleTranslator
 # 한국 시간대 (UTC+9)
 KST = timezone(timedelta(hours=9))
 
+# 차트로 보내는 y값 dtype (계산은 float64로 하고 전송 직전에만 축소 - plotly가 타입 배열 그대로 직렬화)
+CHART_DTYPE = 'float32'
+
+# 시계열 차트 Figure 캐시 크기 (입력 데이터가 같으면 위젯 조작으로 재실행돼도 다시 그리지 않음)
+CHART_CACHE_ENTRIES = 16
+
 # 환경변수 로드
 load_dotenv()
 
@@ -27,7 +37,23 @@ def get_supabase_client():
         return None
     return create_client(url, key)
 
+# Supabase 한 번 응답의 최대 행 수 (PostgREST 기본 max_rows)
+SUPABASE_PAGE_SIZE = 1000
+
+def fetch_all_pages(build_query):
+    """build_query()로 만든 쿼리를 페이지 단위로 끝까지 조회 (응답 행 수 제한에 잘리지 않도록)"""
+    rows = []
+    while True:
+        # range()는 쿼리 객체에 파라미터를 추가하므로 페이지마다 새 쿼리 사용
+        page = build_query().range(len(rows), len(rows) + SUPABASE_PAGE_SIZE - 1).execute().data
+        rows.extend(page)
+        if len(page) < SUPABASE_PAGE_SIZE:
+            return rows
+
+# KPI 숫자는 대부분 float이므로 NaN이 아니면 변환/예외 처리 없이 바로 포맷
 def format_krw(value):
+    if isinstance(value, (int, float)) and value == value:
+        return f"{value:,.0f}"
     if pd.isna(value) or value is None:
         return "0"
     try:
@@ -36,6 +62,8 @@ def format_krw(value):
         return str(value)
 
 def format_usd(value):
+    if isinstance(value, (int, float)) and value == value:
+        return f"${value:,.2f}"
     if pd.isna(value) or value is None:
         return "$0"
     try:
@@ -43,33 +71,101 @@ def format_usd(value):
     except:
         return str(value)
 
-@st.cache_data(ttl=3600)
-def translate_to_korean(text):
-    if not text or pd.isna(text):
-        return ""
+# 번역 동시 요청 수
+TRANSLATE_WORKERS = 8
+
+# 번역 결과를 보관하는 로컬 SQLite 파일 (프로세스가 재시작돼도 이미 번역한 문구는 재사용)
+TRANSLATION_DB = os.getenv("TRANSLATION_DB", "translation_cache.db")
+
+@st.cache_resource
+def get_translation_db():
+    """번역 캐시 DB 연결 (세션/재실행마다 다시 열지 않고 프로세스에서 하나를 공유)"""
+    conn = sqlite3.connect(TRANSLATION_DB, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("CREATE TABLE IF NOT EXISTS reason_translations (reason TEXT PRIMARY KEY, reason_kr TEXT)")
+    return conn
+
+# 여러 세션 스레드가 같은 연결로 동시에 트랜잭션을 열지 않도록 보호
+TRANSLATION_DB_LOCK = threading.Lock()
+
+@st.cache_resource
+def get_translation_cache():
+    """번역 결과 저장소 (원문 → 번역, 시작 시 디스크에서 한 번 불러옴)"""
     try:
-        translator = GoogleTranslator(source='en', target='ko')
-        return translator.translate(text[:4500] if len(text) > 4500 else text)
+        with TRANSLATION_DB_LOCK:
+            return dict(get_translation_db().execute("SELECT reason, reason_kr FROM reason_translations"))
+    except sqlite3.Error:
+        return {}
+
+def save_translations(pairs):
+    """새로 번역한 (원문, 번역) 목록을 디스크에 저장"""
+    try:
+        with TRANSLATION_DB_LOCK:
+            conn = get_translation_db()
+            with conn:
+                conn.executemany("INSERT OR IGNORE INTO reason_translations VALUES (?, ?)", pairs)
+    except sqlite3.Error:
+        pass  # 저장에 실패해도 메모리 캐시는 유지
+
+def _translate_one(text):
+    # GoogleTranslator는 요청 파라미터를 인스턴스에 저장하므로 스레드마다 새로 생성
+    try:
+        return GoogleTranslator(source='en', target='ko').translate(text[:4500]), True
     except Exception as e:
-        return f"번역 실패: {e}"
+        return f"번역 실패: {e}", False
+
+def translate_many_to_korean(texts):
+    """여러 문구를 한국어로 번역 (캐시에 없는 고유 문구만 동시에 요청) → {원문: 번역}"""
+    cache = get_translation_cache()
+    missing = [t for t in set(texts) if t and t not in cache]
+    failed = {}
+    if missing:
+        translated_pairs = []
+        with ThreadPoolExecutor(max_workers=TRANSLATE_WORKERS) as pool:
+            for text, (translated, ok) in zip(missing, pool.map(_translate_one, missing)):
+                # 실패한 결과는 저장하지 않아 다음 실행 때 다시 시도
+                if ok:
+                    cache[text] = translated
+                    translated_pairs.append((text, translated))
+                else:
+                    failed[text] = translated
+        if translated_pairs:
+            save_translations(translated_pairs)
+    return {t: cache.get(t) or failed.get(t, t) for t in texts}
 
 # ============================================================================
 # 성과 분석 함수들
 # ============================================================================
 
-def calculate_trade_stats(trades_df, price_col='btc_krw_price', balance_col='btc_balance'):
-    """거래 통계 계산 (승률, 평균수익 등)"""
-    if trades_df.empty or len(trades_df) < 2:
-        return {'win_rate': 0, 'avg_profit': 0, 'avg_loss': 0, 'profit_factor': 0, 'total_trades': 0}
-
-    df = trades_df.sort_values('timestamp').copy()
+# 모델 문자열에 포함된 키워드 → 모델 계열 이름 (앞에서부터 먼저 맞는 것 사용)
+MODEL_FAMILIES = (('sonnet', 'Sonnet'), ('haiku', 'Haiku'), ('opus', 'Opus'))
 
-    # 각 거래의 손익 계산 (이전 거래 대비)
-    df['total_value'] = df['krw_balance'] + df[balance_col] * df[price_col]
-    df['pnl'] = df['total_value'].diff()
+def normalize_model_names(models):
+    """모델 컬럼을 Sonnet/Haiku/Opus/Other/Unknown으로 정규화 (행별 함수 호출 없이 컬럼 단위 문자열 연산)"""
+    lower = models.astype('string').str.lower()
+    names = np.select(
+        [lower.str.contains(keyword, regex=False).fillna(False).to_numpy(dtype=bool) for keyword, _ in MODEL_FAMILIES],
+        [name for _, name in MODEL_FAMILIES],
+        default='Other'
+    )
+    missing = (lower.isna() | (lower == '')).to_numpy(dtype=bool)
+    return pd.Series(np.where(missing, 'Unknown', names), index=models.index)
+
+def calculate_trade_pnl(trades_df, price_col='btc_krw_price', balance_col='btc_balance'):
+    """시간순 거래 + 총자산/직전 거래 대비 손익 컬럼 (통계/시간대별/모델별 분석이 공유하는 한 번의 계산)"""
+    # 조회 결과가 최신순이므로 뒤집기만 하면 시간순 (diff가 직전 거래 대비가 되도록)
+    df = trades_df.iloc[::-1]
+    total_value = df['krw_balance'] + df[balance_col] * df[price_col]
+    return df.assign(total_value=total_value, pnl=total_value.diff())
+
+def calculate_trade_stats(pnl_df):
+    """거래 통계 계산 (승률, 평균수익 등) - calculate_trade_pnl 결과 사용"""
+    if pnl_df.empty or len(pnl_df) < 2:
+        return {'win_rate': 0, 'avg_profit': 0, 'avg_loss': 0, 'profit_factor': 0, 'total_trades': 0}
 
     # 첫 거래 제외
-    df = df.iloc[1:]
+    df = pnl_df.iloc[1:]
 
     if df.empty:
         return {'win_rate': 0, 'avg_profit': 0, 'avg_loss': 0, 'profit_factor': 0, 'total_trades': 0}
@@ -95,63 +191,50 @@ def calculate_trade_stats(trades_df, price_col='btc_krw_price', balance_col='btc
         'loss_count': len(losses),
     }
 
-def calculate_hourly_performance(trades_df):
-    """시간대별 성과 분석"""
-    if trades_df.empty:
+def calculate_hourly_performance(pnl_df):
+    """시간대별 성과 분석 - calculate_trade_pnl 결과 사용"""
+    if pnl_df.empty:
         return pd.DataFrame()
 
-    df = trades_df.copy()
-    df['hour'] = df['timestamp'].dt.hour
-    df['total_value'] = df['krw_balance'] + df['btc_balance'] * df['btc_krw_price']
-    df['pnl'] = df['total_value'].diff()
-
-    hourly = df.groupby('hour').agg({
-        'pnl': ['sum', 'count', 'mean']
-    }).round(0)
+    hourly = pnl_df['pnl'].groupby(pnl_df['timestamp'].dt.hour.rename('hour')).agg(['sum', 'count', 'mean']).round(0)
     hourly.columns = ['total_pnl', 'trade_count', 'avg_pnl']
     hourly = hourly.reset_index()
 
     return hourly
 
-def calculate_model_performance(trades_df):
-    """모델별 성과 분석"""
-    if trades_df.empty or 'model' not in trades_df.columns:
+def calculate_model_performance(pnl_df):
+    """모델별 성과 분석 - calculate_trade_pnl 결과 사용"""
+    if pnl_df.empty or 'model' not in pnl_df.columns:
         return pd.DataFrame()
 
-    df = trades_df.copy()
-    df['total_value'] = df['krw_balance'] + df['btc_balance'] * df['btc_krw_price']
-    df['pnl'] = df['total_value'].diff()
-
-    # 모델명 정규화
-    def normalize_model(m):
-        if pd.isna(m) or not m:
-            return 'Unknown'
-        m = str(m).lower()
-        if 'sonnet' in m:
-            return 'Sonnet'
-        if 'haiku' in m:
-            return 'Haiku'
-        if 'opus' in m:
-            return 'Opus'
-        return 'Other'
-
-    df['model_name'] = df['model'].apply(normalize_model)
+    model_name = normalize_model_names(pnl_df['model']).rename('model_name')
+    pnl = pnl_df['pnl']
 
-    model_stats = df.groupby('model_name').agg({
-        'pnl': ['sum', 'count', 'mean'],
-    }).round(0)
+    model_stats = pnl.groupby(model_name).agg(['sum', 'count', 'mean']).round(0)
     model_stats.columns = ['total_pnl', 'trade_count', 'avg_pnl']
     model_stats = model_stats.reset_index()
 
-    # 승률 계산
-    for model in model_stats['model_name'].unique():
-        model_df = df[df['model_name'] == model]
-        wins = len(model_df[model_df['pnl'] > 0])
-        total = len(model_df[model_df['pnl'].notna()])
-        model_stats.loc[model_stats['model_name'] == model, 'win_rate'] = (wins / total * 100) if total > 0 else 0
+    # 승률 계산 (모델별 수익 거래 수 / 손익이 있는 거래 수를 한 번에 집계)
+    wins = (pnl > 0).groupby(model_name).sum()
+    totals = pnl.notna().groupby(model_name).sum()
+    model_stats['win_rate'] = model_stats['model_name'].map((wins / totals * 100).fillna(0))
 
     return model_stats
 
+@st.cache_data(ttl=60, show_spinner=False)
+def get_trade_analytics(days=30):
+    """거래 통계/모델별/시간대별 성과 (거래 조회 캐시와 같은 주기로 한 번만 계산)"""
+    trades_df = get_trades_from_supabase(days)
+    if trades_df.empty:
+        return calculate_trade_stats(trades_df), pd.DataFrame(), pd.DataFrame()
+    # 총자산/손익 컬럼은 한 번만 만들어 세 분석에서 함께 사용
+    pnl_df = calculate_trade_pnl(trades_df)
+    return (
+        calculate_trade_stats(pnl_df),
+        calculate_model_performance(pnl_df),
+        calculate_hourly_performance(pnl_df),
+    )
+
 @st.cache_data(ttl=300)
 def get_btc_history(days=30):
     """BTC 가격 히스토리 (벤치마크용)"""
@@ -180,6 +263,10 @@ def get_upbit_client():
     except:
         return None
 
+# 대시보드에서 쓰는 trades 컬럼 (긴 AI 반성문 reflection은 화면에 쓰지 않으므로 받지 않음)
+TRADE_COLUMNS = ("timestamp,decision,percentage,reason,source,model,trigger_reason,pnl_percentage,"
+                 "btc_balance,krw_balance,btc_avg_buy_price,btc_krw_price")
+
 @st.cache_data(ttl=60)
 def get_trades_from_supabase(days=30):
     supabase = get_supabase_client()
@@ -187,11 +274,14 @@ def get_trades_from_supabase(days=30):
         return pd.DataFrame()
     try:
         cutoff = (datetime.now() - timedelta(days=days)).isoformat()
-        response = supabase.table("trades").select("*").gte("timestamp", cutoff).order("timestamp", desc=True).execute()
-        if response.data:
-            df = pd.DataFrame(response.data)
+        # 최신순으로 반환 - 시간순이 필요한 곳은 정렬 대신 iloc[::-1] 사용
+        rows = fetch_all_pages(lambda: supabase.table("trades").select(TRADE_COLUMNS).gte("timestamp", cutoff).order("timestamp", desc=True))
+        if rows:
+            df = pd.DataFrame(rows)
             ts = pd.to_datetime(df['timestamp'])
             df['timestamp'] = ts.dt.tz_convert('Asia/Seoul') if ts.dt.tz else ts.dt.tz_localize('UTC').dt.tz_convert('Asia/Seoul')
+            # 결정 값은 buy/sell/hold 몇 가지뿐 - 범주형이면 비교/집계가 정수 코드 위에서 처리됨
+            df['decision'] = df['decision'].astype('category')
             return df
         return pd.DataFrame()
     except:
@@ -230,40 +320,37 @@ def get_trading_fees(orders_df, days=30):
     except:
         return 0
 
+# 업비트 입출금 응답에서 완료 건만 골라 컬럼 단위로 변환 (행별 파싱 없음)
+def _upbit_transfer_frame(items, done_state, kind, memo):
+    if not items:
+        return pd.DataFrame()
+    raw = pd.DataFrame(items)
+    raw = raw[raw['state'] == done_state]
+    return pd.DataFrame({
+        'id': raw['uuid'],
+        'created_at': pd.to_datetime(raw['created_at']),
+        'type': kind,
+        'amount': pd.to_numeric(raw['amount'], errors='coerce').fillna(0.0),
+        'memo': memo
+    })
+
 @st.cache_data(ttl=300)
 def get_deposits_from_upbit():
     upbit = get_upbit_client()
     if not upbit:
         return pd.DataFrame()
     try:
-        records = []
-        deposits = upbit.get_deposits(currency="KRW")
-        if deposits:
-            for d in deposits:
-                if d.get('state') == 'accepted':
-                    records.append({
-                        'id': d.get('uuid', ''),
-                        'created_at': pd.to_datetime(d.get('created_at')),
-                        'type': 'deposit',
-                        'amount': float(d.get('amount', 0)),
-                        'memo': '업비트 원화 입금'
-                    })
-        withdraws = upbit.get_withdraws(currency="KRW")
-        if withdraws:
-            for w in withdraws:
-                if w.get('state') == 'done':
-                    records.append({
-                        'id': w.get('uuid', ''),
-                        'created_at': pd.to_datetime(w.get('created_at')),
-                        'type': 'withdraw',
-                        'amount': float(w.get('amount', 0)),
-                        'memo': '업비트 원화 출금'
-                    })
-        if records:
-            df = pd.DataFrame(records)
+        frames = [
+            _upbit_transfer_frame(upbit.get_deposits(currency="KRW"), 'accepted', 'deposit', '업비트 원화 입금'),
+            _upbit_transfer_frame(upbit.get_withdraws(currency="KRW"), 'done', 'withdraw', '업비트 원화 출금')
+        ]
+        frames = [f for f in frames if not f.empty]
+        if frames:
+            df = pd.concat(frames, ignore_index=True)
             ts = df['created_at']
             df['created_at'] = ts.dt.tz_convert('Asia/Seoul') if ts.dt.tz is not None else ts.dt.tz_localize('UTC').dt.tz_convert('Asia/Seoul')
-            return df.sort_values('created_at', ascending=False)
+            # 입금/출금 목록이 각각 시간순으로 오므로 stable 정렬은 구간 병합으로 끝남
+            return df.sort_values('created_at', ascending=False, kind='stable')
         return pd.DataFrame()
     except:
         return pd.DataFrame()
@@ -300,7 +387,9 @@ def get_expenses():
     except:
         return pd.DataFrame()
 
+@st.cache_data(ttl=60)
 def get_all_deposits():
+    """업비트 + 수동 입출금 병합 (재실행마다 다시 합치고 정렬하지 않도록 캐시)"""
     upbit = get_deposits_from_upbit()
     manual = get_manual_deposits()
     if upbit.empty and manual.empty:
@@ -309,7 +398,8 @@ def get_all_deposits():
         return manual
     elif manual.empty:
         return upbit
-    return pd.concat([upbit, manual], ignore_index=True).sort_values('created_at', ascending=False)
+    # 두 프레임 모두 이미 최신순 - stable(timsort) 정렬은 정렬된 구간을 병합만 하므로 O(N)
+    return pd.concat([upbit, manual], ignore_index=True).sort_values('created_at', ascending=False, kind='stable')
 
 @st.cache_data(ttl=30)
 def get_current_btc_price():
@@ -358,6 +448,16 @@ def delete_expense(expense_id):
     except:
         return False
 
+def sum_deposits(deposits_df):
+    """총 입금액/총 출금액 (유형별 부분 프레임을 만들지 않고 금액 컬럼을 한 번만 집계)"""
+    if deposits_df.empty:
+        return 0, 0
+    totals = deposits_df['amount'].groupby(deposits_df['type']).sum()
+    return totals.get('deposit', 0), totals.get('withdraw', 0)
+
+# 비용 주기별 월 환산 배수 (그 외 주기는 조회 기간 기준으로 환산)
+EXPENSE_PERIOD_FACTORS = {'monthly': 1, 'daily': 30, 'yearly': 1 / 12}
+
 def calculate_monthly_expenses(expenses_df, trading_fees=0, days=30):
     total = 0
     by_cat = {'api': 0, 'server': 0, 'trading_fee': 0, 'other': 0}
@@ -365,37 +465,31 @@ def calculate_monthly_expenses(expenses_df, trading_fees=0, days=30):
     by_cat['trading_fee'] = monthly_trading_fee
     total += monthly_trading_fee
     if not expenses_df.empty:
-        for _, row in expenses_df.iterrows():
-            amount = float(row['amount'])
-            period = row.get('period', 'monthly')
-            cat = row.get('category', 'other')
-            if period == 'monthly':
-                monthly = amount
-            elif period == 'daily':
-                monthly = amount * 30
-            elif period == 'yearly':
-                monthly = amount / 12
-            else:
-                monthly = amount * (30 / days)
-            total += monthly
-            by_cat[cat] = by_cat.get(cat, 0) + monthly
+        periods = expenses_df['period'] if 'period' in expenses_df.columns else pd.Series('monthly', index=expenses_df.index)
+        categories = expenses_df['category'] if 'category' in expenses_df.columns else pd.Series('other', index=expenses_df.index)
+        factors = periods.map(EXPENSE_PERIOD_FACTORS).fillna(30 / days if days > 0 else 1)
+        monthly = expenses_df['amount'].astype(float) * factors
+        total += monthly.sum()
+        for cat, amount in monthly.groupby(categories, dropna=False).sum().items():
+            by_cat[cat] = by_cat.get(cat, 0) + amount
     return total, by_cat
 
 def calculate_performance(trades_df, deposits_df, expenses_df, current_btc_price, days=30, trading_fees=0):
     if trades_df.empty:
         return {}
-    df_sorted = trades_df.sort_values('timestamp')
-    last = df_sorted.iloc[-1]
-    price = current_btc_price or last['btc_krw_price']
-    current_total = last['krw_balance'] + last['btc_balance'] * price
-    total_dep = deposits_df[deposits_df['type'] == 'deposit']['amount'].sum() if not deposits_df.empty else 0
-    total_wd = deposits_df[deposits_df['type'] == 'withdraw']['amount'].sum() if not deposits_df.empty else 0
+    latest = trades_df.iloc[0].to_dict()
+    price = current_btc_price or latest['btc_krw_price']
+    current_total = latest['krw_balance'] + latest['btc_balance'] * price
+    total_dep, total_wd = sum_deposits(deposits_df)
     net_dep = total_dep - total_wd
     monthly_exp, exp_by_cat = calculate_monthly_expenses(expenses_df, trading_fees, days)
     real_profit = current_total - net_dep
     real_rate = (real_profit / net_dep * 100) if net_dep > 0 else 0
     net_profit = real_profit - monthly_exp
     net_rate = (net_profit / net_dep * 100) if net_dep > 0 else 0
+    # 결정/출처별 건수는 컬럼당 한 번의 집계로 계산
+    decision_counts = trades_df['decision'].value_counts()
+    source_counts = trades_df['source'].value_counts() if 'source' in trades_df.columns else pd.Series(dtype='int64')
     return {
         'current_total': current_total,
         'total_deposits': total_dep,
@@ -408,13 +502,13 @@ def calculate_performance(trades_df, deposits_df, expenses_df, current_btc_price
         'net_profit': net_profit,
         'net_rate': net_rate,
         'total_trades': len(trades_df),
-        'buy_count': len(trades_df[trades_df['decision'] == 'buy']),
-        'sell_count': len(trades_df[trades_df['decision'] == 'sell']),
-        'hold_count': len(trades_df[trades_df['decision'] == 'hold']),
-        'scheduled_count': len(trades_df[trades_df['source'] == 'scheduled']) if 'source' in trades_df.columns else 0,
-        'triggered_count': len(trades_df[trades_df['source'] == 'triggered']) if 'source' in trades_df.columns else 0,
-        'stop_loss_count': len(trades_df[trades_df['source'] == 'stop_loss']) if 'source' in trades_df.columns else 0,
-        'take_profit_count': len(trades_df[trades_df['source'] == 'take_profit']) if 'source' in trades_df.columns else 0
+        'buy_count': int(decision_counts.get('buy', 0)),
+        'sell_count': int(decision_counts.get('sell', 0)),
+        'hold_count': int(decision_counts.get('hold', 0)),
+        'scheduled_count': int(source_counts.get('scheduled', 0)),
+        'triggered_count': int(source_counts.get('triggered', 0)),
+        'stop_loss_count': int(source_counts.get('stop_loss', 0)),
+        'take_profit_count': int(source_counts.get('take_profit', 0))
     }
 
 # ============================================================================
@@ -434,11 +528,17 @@ def get_us_stock_trades(days=30):
             df = pd.DataFrame(response.data)
             ts = pd.to_datetime(df['created_at'])
             df['created_at'] = ts.dt.tz_convert('Asia/Seoul') if ts.dt.tz else ts.dt.tz_localize('UTC').dt.tz_convert('Asia/Seoul')
+            # 거래 유형도 코인 결정과 같이 범주형으로 (buy/sell/stop_loss/take_profit)
+            if 'action' in df.columns:
+                df['action'] = df['action'].astype('category')
             return df
         return pd.DataFrame()
     except:
         return pd.DataFrame()
 
+# 포트폴리오 스냅샷에서 대시보드가 쓰는 요약 컬럼 (행마다 큰 positions/market_condition JSONB는 받지 않음)
+SNAPSHOT_COLUMNS = "id,created_at,total_value,cash,cash_ratio,invested,unrealized_pnl,unrealized_pnl_pct"
+
 @st.cache_data(ttl=60)
 def get_us_portfolio_snapshots(days=30):
     """포트폴리오 스냅샷 조회"""
@@ -447,9 +547,13 @@ def get_us_portfolio_snapshots(days=30):
         return pd.DataFrame()
     try:
         cutoff = (datetime.now() - timedelta(days=days)).isoformat()
-        response = supabase.table("us_stock_portfolio_snapshots").select("*").gte("created_at", cutoff).order("created_at", desc=True).execute()
-        if response.data:
-            df = pd.DataFrame(response.data)
+        # 최신순으로 반환 - 시간순이 필요한 곳은 정렬 대신 iloc[::-1] 사용
+        rows = fetch_all_pages(lambda: supabase.table("us_stock_portfolio_snapshots").select(SNAPSHOT_COLUMNS).gte("created_at", cutoff).order("created_at", desc=True))
+        if rows:
+            # 보유 종목 상세(JSONB)는 화면에서 최신 스냅샷 것만 쓰므로 그 한 행만 따로 조회
+            latest = supabase.table("us_stock_portfolio_snapshots").select("positions").eq("id", rows[0]['id']).execute().data
+            rows[0]['positions'] = latest[0]['positions'] if latest else None
+            df = pd.DataFrame(rows)
             ts = pd.to_datetime(df['created_at'])
             df['created_at'] = ts.dt.tz_convert('Asia/Seoul') if ts.dt.tz else ts.dt.tz_localize('UTC').dt.tz_convert('Asia/Seoul')
             return df
@@ -492,11 +596,7 @@ def add_us_stock_deposit(amount, deposit_type, memo):
 def calculate_us_stock_performance(portfolio_df, deposits_df, trades_df):
     """미국 주식 실질 수익 계산"""
     # 입출금 계산 (항상 먼저)
-    total_deposits = 0
-    total_withdrawals = 0
-    if not deposits_df.empty:
-        total_deposits = deposits_df[deposits_df['type'] == 'deposit']['amount'].sum()
-        total_withdrawals = deposits_df[deposits_df['type'] == 'withdraw']['amount'].sum()
+    total_deposits, total_withdrawals = sum_deposits(deposits_df)
     net_deposits = total_deposits - total_withdrawals
 
     # 포트폴리오 스냅샷이 없는 경우 (아직 거래 시스템 미실행)
@@ -515,7 +615,7 @@ def calculate_us_stock_performance(portfolio_df, deposits_df, trades_df):
             'invested': 0,
         }
 
-    latest = portfolio_df.iloc[0]
+    latest = portfolio_df.iloc[0].to_dict()
     current_total = latest.get('total_value', 0)
 
     # 실현 손익 (거래 기록에서)
@@ -582,19 +682,7 @@ def calculate_us_model_performance(trades_df):
 
     df = trades_df.copy()
 
-    def normalize_model(m):
-        if pd.isna(m) or not m:
-            return 'Unknown'
-        m = str(m).lower()
-        if 'sonnet' in m:
-            return 'Sonnet'
-        if 'haiku' in m:
-            return 'Haiku'
-        if 'opus' in m:
-            return 'Opus'
-        return 'Other'
-
-    df['model_name'] = df['model'].apply(normalize_model)
+    df['model_name'] = normalize_model_names(df['model'])
     df = df[df['pnl'].notna()]
 
     if df.empty:
@@ -606,14 +694,22 @@ def calculate_us_model_performance(trades_df):
     model_stats.columns = ['total_pnl', 'trade_count', 'avg_pnl']
     model_stats = model_stats.reset_index()
 
-    for model in model_stats['model_name'].unique():
-        model_df = df[df['model_name'] == model]
-        wins = len(model_df[model_df['pnl'] > 0])
-        total = len(model_df)
-        model_stats.loc[model_stats['model_name'] == model, 'win_rate'] = (wins / total * 100) if total > 0 else 0
+    # 승률 계산 (pnl 결측 행은 위에서 제외됨)
+    wins = (df['pnl'] > 0).groupby(df['model_name']).sum()
+    model_stats['win_rate'] = model_stats['model_name'].map(wins / model_stats.set_index('model_name')['trade_count'] * 100)
 
     return model_stats
 
+@st.cache_data(ttl=60, show_spinner=False)
+def get_us_analytics(days=30):
+    """미국 주식 실질 수익/거래 통계/모델별 성과 (조회 캐시와 같은 주기로 한 번만 계산)"""
+    trades_df = get_us_stock_trades(days)
+    return (
+        calculate_us_stock_performance(get_us_portfolio_snapshots(days), get_us_stock_deposits(), trades_df),
+        calculate_us_trade_stats(trades_df),
+        calculate_us_model_performance(trades_df),
+    )
+
 @st.cache_data(ttl=300)
 def get_sp500_history(days=30):
     """S&P 500 히스토리 (벤치마크용)"""
@@ -628,6 +724,7 @@ def get_sp500_history(days=30):
         pass
     return pd.DataFrame()
 
+@st.cache_data(show_spinner=False, max_entries=CHART_CACHE_ENTRIES)
 def create_us_benchmark_chart(portfolio_df, sp500_df):
     """US 포트폴리오 vs S&P 500 비교 차트"""
     if portfolio_df.empty:
@@ -636,30 +733,28 @@ def create_us_benchmark_chart(portfolio_df, sp500_df):
         fig.update_layout(margin=dict(l=0, r=0, t=30, b=0), height=280, template='plotly_dark')
         return fig
 
-    df = portfolio_df.sort_values('created_at').copy()
+    df = portfolio_df.iloc[::-1]
 
-    # 시작점 기준 수익률 계산
-    initial_value = df['total_value'].iloc[0]
-    df['portfolio_return'] = (df['total_value'] / initial_value - 1) * 100
+    # 시작점 기준 수익률 계산 (입력 프레임은 건드리지 않음)
+    portfolio_return = (df['total_value'] / df['total_value'].iloc[0] - 1) * 100
+    x, portfolio_return = downsample_xy(df['created_at'], portfolio_return)
 
     fig = go.Figure()
 
     # 포트폴리오 수익률
-    fig.add_trace(go.Scatter(
-        x=df['created_at'], y=df['portfolio_return'],
+    fig.add_trace(go.Scattergl(
+        x=x, y=portfolio_return.astype(CHART_DTYPE),
         mode='lines', name='포트폴리오',
         line=dict(color='#00D4AA', width=2)
     ))
 
     # S&P 500 수익률
     if not sp500_df.empty:
-        sp = sp500_df.copy()
-        sp['timestamp'] = pd.to_datetime(sp['timestamp'])
-        initial_sp = sp['close'].iloc[0]
-        sp['sp_return'] = (sp['close'] / initial_sp - 1) * 100
+        sp_close = sp500_df['close']
+        sp_return = (sp_close / sp_close.iloc[0] - 1) * 100
 
-        fig.add_trace(go.Scatter(
-            x=sp['timestamp'], y=sp['sp_return'],
+        fig.add_trace(go.Scattergl(
+            x=pd.to_datetime(sp500_df['timestamp']), y=sp_return,
             mode='lines', name='S&P 500',
             line=dict(color='#4ECDC4', width=2, dash='dash')
         ))
@@ -702,6 +797,22 @@ def create_us_model_chart(model_df):
     )
     return fig
 
+# 지수/섹터 ETF 시세 동시 조회 수
+MARKET_FETCH_WORKERS = 8
+
+def _fetch_recent_close(symbol):
+    try:
+        hist = yf.Ticker(symbol).history(period="5d")
+        return hist['Close'] if not hist.empty else None
+    except:
+        return None
+
+def fetch_recent_closes(symbols):
+    """여러 종목의 최근 5일 종가를 동시에 조회 (네트워크 대기가 대부분이라 스레드로 겹침) → {심볼: 종가 Series}"""
+    with ThreadPoolExecutor(max_workers=MARKET_FETCH_WORKERS) as pool:
+        closes = dict(zip(symbols, pool.map(_fetch_recent_close, symbols)))
+    return {symbol: close for symbol, close in closes.items() if close is not None}
+
 @st.cache_data(ttl=300)
 def get_market_indices():
     """주요 시장 지수 조회"""
@@ -711,21 +822,18 @@ def get_market_indices():
         "^DJI": "Dow Jones",
         "^VIX": "VIX",
     }
+    closes = fetch_recent_closes(list(indices))
     result = {}
     for symbol, name in indices.items():
-        try:
-            ticker = yf.Ticker(symbol)
-            hist = ticker.history(period="5d")
-            if not hist.empty:
-                current = hist['Close'].iloc[-1]
-                prev = hist['Close'].iloc[-2] if len(hist) > 1 else current
-                result[name] = {
-                    "price": current,
-                    "change": current - prev,
-                    "change_pct": (current - prev) / prev * 100,
-                }
-        except:
-            pass
+        if symbol in closes:
+            close = closes[symbol]
+            current = close.iloc[-1]
+            prev = close.iloc[-2] if len(close) > 1 else current
+            result[name] = {
+                "price": current,
+                "change": current - prev,
+                "change_pct": (current - prev) / prev * 100,
+            }
     return result
 
 @st.cache_data(ttl=300)
@@ -755,29 +863,68 @@ def get_sector_performance():
         "XLP": "Consumer Staples",
         "XLI": "Industrials",
     }
+    closes = fetch_recent_closes(list(sector_etfs))
     result = {}
     for symbol, sector in sector_etfs.items():
-        try:
-            ticker = yf.Ticker(symbol)
-            hist = ticker.history(period="5d")
-            if not hist.empty:
-                current = hist['Close'].iloc[-1]
-                prev = hist['Close'].iloc[-2] if len(hist) > 1 else current
-                result[sector] = {
-                    "change_pct": (current - prev) / prev * 100,
-                }
-        except:
-            pass
+        if symbol in closes:
+            close = closes[symbol]
+            current = close.iloc[-1]
+            prev = close.iloc[-2] if len(close) > 1 else current
+            result[sector] = {
+                "change_pct": (current - prev) / prev * 100,
+            }
     return result
 
 # ============================================================================
 # 코인 차트 함수들
 # ============================================================================
 
+# 라인 차트에 보낼 최대 포인트 수 (넘으면 LTTB로 모양을 유지하며 줄임)
+MAX_CHART_POINTS = 500
+
+def lttb_indices(x, y, n_out):
+    """Largest-Triangle-Three-Buckets 다운샘플링 - 남길 행 위치 반환 (첫/마지막 점 포함)"""
+    n = len(y)
+    if n <= n_out or n_out < 3:
+        return np.arange(n)
+    # 첫/마지막 점을 제외한 구간을 n_out - 2개 버킷으로 나눔
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    idx = np.empty(n_out, dtype=int)
+    idx[0], idx[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        # 다음 버킷의 평균점 (마지막 버킷은 마지막 점)
+        if i + 2 < len(edges):
+            nx, ny = x[hi:edges[i + 2]].mean(), y[hi:edges[i + 2]].mean()
+        else:
+            nx, ny = x[-1], y[-1]
+        # 직전 선택점-후보-다음 평균점 삼각형 넓이가 가장 큰 후보 선택
+        area = np.abs((x[a] - nx) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (ny - y[a]))
+        a = lo + int(area.argmax())
+        idx[i + 1] = a
+    return idx
+
+def downsample_for_chart(df, y_col, max_points=MAX_CHART_POINTS, x_col='timestamp'):
+    """시간순 정렬된 df를 y_col 기준으로 다운샘플링 (포인트가 많을 때만)"""
+    if len(df) <= max_points:
+        return df
+    x = (df[x_col] - df[x_col].iloc[0]).dt.total_seconds().to_numpy()
+    return df.iloc[lttb_indices(x, df[y_col].to_numpy(dtype=float), max_points)]
+
+def downsample_xy(x, y, max_points=MAX_CHART_POINTS):
+    """시간 x / 값 y Series 쌍을 다운샘플링 (프레임 없이 계산한 파생 시리즈용)"""
+    if len(y) <= max_points:
+        return x, y
+    secs = (x - x.iloc[0]).dt.total_seconds().to_numpy()
+    idx = lttb_indices(secs, y.to_numpy(dtype=float), max_points)
+    return x.iloc[idx], y.iloc[idx]
+
+@st.cache_data(show_spinner=False, max_entries=CHART_CACHE_ENTRIES)
 def create_asset_chart(df, deposits_df, current_price, start_date=None):
     if df.empty:
         return go.Figure()
-    df_sorted = df.sort_values('timestamp').copy()
+    df_sorted = df.iloc[::-1]  # 파생 컬럼은 assign으로 새 프레임에 추가하므로 복사 불필요
     if start_date is not None:
         start_datetime = datetime.combine(start_date, datetime.min.time())
         start_datetime = start_datetime.replace(tzinfo=KST)
@@ -788,12 +935,12 @@ def create_asset_chart(df, deposits_df, current_price, start_date=None):
         fig.update_layout(margin=dict(l=0, r=0, t=30, b=0), height=280, template='plotly_dark')
         return fig
     price = current_price or df_sorted['btc_krw_price'].iloc[-1]
-    df_sorted['total'] = df_sorted['krw_balance'] + df_sorted['btc_balance'] * price
-    initial = df_sorted['total'].iloc[0]
-    df_sorted['change'] = df_sorted['total'] - initial
+    total = df_sorted['krw_balance'] + df_sorted['btc_balance'] * price
+    df_sorted = df_sorted.assign(total=total, change=total - total.iloc[0])
+    df_sorted = downsample_for_chart(df_sorted, 'change')
     fig = go.Figure()
-    fig.add_trace(go.Scatter(
-        x=df_sorted['timestamp'], y=df_sorted['change'],
+    fig.add_trace(go.Scattergl(
+        x=df_sorted['timestamp'], y=df_sorted['change'].astype(CHART_DTYPE),
         mode='lines', name='자산 증감',
         line=dict(color='#00D4AA', width=2),
         fill='tozeroy', fillcolor='rgba(0, 212, 170, 0.1)'
@@ -808,10 +955,11 @@ def create_asset_chart(df, deposits_df, current_price, start_date=None):
     )
     return fig
 
+@st.cache_data(show_spinner=False, max_entries=CHART_CACHE_ENTRIES)
 def create_profit_chart(df, deposits_df, current_price, start_date=None):
     if df.empty:
         return go.Figure()
-    df_sorted = df.sort_values('timestamp').copy()
+    df_sorted = df.iloc[::-1]  # 파생 컬럼은 assign으로 새 프레임에 추가하므로 복사 불필요
     if start_date is not None:
         start_datetime = datetime.combine(start_date, datetime.min.time())
         start_datetime = start_datetime.replace(tzinfo=KST)
@@ -821,16 +969,14 @@ def create_profit_chart(df, deposits_df, current_price, start_date=None):
         fig.add_annotation(text="데이터 없음", xref="paper", yref="paper", x=0.5, y=0.5, showarrow=False)
         fig.update_layout(margin=dict(l=0, r=0, t=30, b=0), height=280, template='plotly_dark')
         return fig
-    net_deposits = 0
-    if not deposits_df.empty:
-        total_dep = deposits_df[deposits_df['type'] == 'deposit']['amount'].sum()
-        total_wd = deposits_df[deposits_df['type'] == 'withdraw']['amount'].sum()
-        net_deposits = total_dep - total_wd
-    df_sorted['total'] = df_sorted['krw_balance'] + df_sorted['btc_balance'] * current_price
-    df_sorted['profit'] = df_sorted['total'] - net_deposits
+    total_dep, total_wd = sum_deposits(deposits_df)
+    net_deposits = total_dep - total_wd
+    total = df_sorted['krw_balance'] + df_sorted['btc_balance'] * current_price
+    df_sorted = df_sorted.assign(total=total, profit=total - net_deposits)
+    df_sorted = downsample_for_chart(df_sorted, 'profit')
     fig = go.Figure()
-    fig.add_trace(go.Scatter(
-        x=df_sorted['timestamp'], y=df_sorted['profit'],
+    fig.add_trace(go.Scattergl(
+        x=df_sorted['timestamp'], y=df_sorted['profit'].astype(CHART_DTYPE),
         mode='lines+markers', name='실질 수익',
         line=dict(color='#00D4AA', width=2),
         marker=dict(size=4),
@@ -846,13 +992,14 @@ def create_profit_chart(df, deposits_df, current_price, start_date=None):
     )
     return fig
 
+@st.cache_data(show_spinner=False, max_entries=CHART_CACHE_ENTRIES)
 def create_btc_chart(df):
     if df.empty:
         return go.Figure()
-    df_sorted = df.sort_values('timestamp')
+    df_sorted = downsample_for_chart(df.iloc[::-1], 'btc_balance')
     fig = go.Figure()
-    fig.add_trace(go.Scatter(
-        x=df_sorted['timestamp'], y=df_sorted['btc_balance'],
+    fig.add_trace(go.Scattergl(
+        x=df_sorted['timestamp'], y=df_sorted['btc_balance'].astype(CHART_DTYPE),
         mode='lines', name='BTC',
         line=dict(color='#F7931A', width=2),
         fill='tozeroy', fillcolor='rgba(247, 147, 26, 0.1)'
@@ -911,6 +1058,7 @@ def create_expense_chart(by_cat):
     )
     return fig
 
+@st.cache_data(show_spinner=False, max_entries=CHART_CACHE_ENTRIES)
 def create_benchmark_chart(trades_df, btc_history_df, deposits_df, current_price):
     """포트폴리오 vs BTC 벤치마크 비교 차트"""
     if trades_df.empty:
@@ -919,32 +1067,30 @@ def create_benchmark_chart(trades_df, btc_history_df, deposits_df, current_price
         fig.update_layout(margin=dict(l=0, r=0, t=30, b=0), height=280, template='plotly_dark')
         return fig
 
-    df = trades_df.sort_values('timestamp').copy()
+    df = trades_df.iloc[::-1]
     price = current_price or df['btc_krw_price'].iloc[-1]
-    df['total'] = df['krw_balance'] + df['btc_balance'] * price
+    total = df['krw_balance'] + df['btc_balance'] * price
 
-    # 시작점 기준 수익률 계산
-    initial_value = df['total'].iloc[0]
-    df['portfolio_return'] = (df['total'] / initial_value - 1) * 100
+    # 시작점 기준 수익률 계산 (입력 프레임은 건드리지 않음)
+    portfolio_return = (total / total.iloc[0] - 1) * 100
+    x, portfolio_return = downsample_xy(df['timestamp'], portfolio_return)
 
     fig = go.Figure()
 
     # 포트폴리오 수익률
-    fig.add_trace(go.Scatter(
-        x=df['timestamp'], y=df['portfolio_return'],
+    fig.add_trace(go.Scattergl(
+        x=x, y=portfolio_return.astype(CHART_DTYPE),
         mode='lines', name='포트폴리오',
         line=dict(color='#00D4AA', width=2)
     ))
 
     # BTC 수익률 (있으면)
     if not btc_history_df.empty:
-        btc = btc_history_df.copy()
-        btc['timestamp'] = pd.to_datetime(btc['timestamp'])
-        initial_btc = btc['close'].iloc[0]
-        btc['btc_return'] = (btc['close'] / initial_btc - 1) * 100
+        btc_close = btc_history_df['close']
+        btc_return = (btc_close / btc_close.iloc[0] - 1) * 100
 
-        fig.add_trace(go.Scatter(
-            x=btc['timestamp'], y=btc['btc_return'],
+        fig.add_trace(go.Scattergl(
+            x=pd.to_datetime(btc_history_df['timestamp']), y=btc_return,
             mode='lines', name='BTC (Buy & Hold)',
             line=dict(color='#F7931A', width=2, dash='dash')
         ))
@@ -1018,6 +1164,7 @@ def create_model_chart(model_df):
 # 미국 주식 차트 함수들
 # ============================================================================
 
+@st.cache_data(show_spinner=False, max_entries=CHART_CACHE_ENTRIES)
 def create_us_portfolio_chart(df):
     """미국 주식 포트폴리오 추이"""
     if df.empty:
@@ -1026,10 +1173,10 @@ def create_us_portfolio_chart(df):
         fig.update_layout(margin=dict(l=0, r=0, t=30, b=0), height=280, template='plotly_dark')
         return fig
 
-    df_sorted = df.sort_values('created_at').copy()
+    df_sorted = downsample_for_chart(df.iloc[::-1], 'total_value', x_col='created_at')
     fig = go.Figure()
-    fig.add_trace(go.Scatter(
-        x=df_sorted['created_at'], y=df_sorted['total_value'],
+    fig.add_trace(go.Scattergl(
+        x=df_sorted['created_at'], y=df_sorted['total_value'].astype(CHART_DTYPE),
         mode='lines', name='총 자산',
         line=dict(color='#00D4AA', width=2),
         fill='tozeroy', fillcolor='rgba(0, 212, 170, 0.1)'
@@ -1043,6 +1190,7 @@ def create_us_portfolio_chart(df):
     )
     return fig
 
+@st.cache_data(show_spinner=False, max_entries=CHART_CACHE_ENTRIES)
 def create_us_pnl_chart(df):
     """미국 주식 손익 추이"""
     if df.empty:
@@ -1051,13 +1199,16 @@ def create_us_pnl_chart(df):
         fig.update_layout(margin=dict(l=0, r=0, t=30, b=0), height=280, template='plotly_dark')
         return fig
 
-    df_sorted = df.sort_values('created_at').copy()
-    if 'unrealized_pnl' not in df_sorted.columns:
-        df_sorted['unrealized_pnl'] = 0
+    df_sorted = df.iloc[::-1]
+    if 'unrealized_pnl' in df_sorted.columns:
+        unrealized_pnl = df_sorted['unrealized_pnl']
+    else:
+        unrealized_pnl = pd.Series(0.0, index=df_sorted.index)
+    x, unrealized_pnl = downsample_xy(df_sorted['created_at'], unrealized_pnl)
 
     fig = go.Figure()
-    fig.add_trace(go.Scatter(
-        x=df_sorted['created_at'], y=df_sorted['unrealized_pnl'],
+    fig.add_trace(go.Scattergl(
+        x=x, y=unrealized_pnl.astype(CHART_DTYPE),
         mode='lines+markers', name='미실현 손익',
         line=dict(color='#4ECDC4', width=2),
         marker=dict(size=4)
@@ -1127,6 +1278,123 @@ def create_us_trade_decision_chart(df):
 # 코인 대시보드
 # ============================================================================
 
+@st.fragment
+def render_coin_trades_table(trades_df):
+    """코인 거래 기록 표 (페이지/언어 버튼은 이 부분만 다시 실행)"""
+    if not trades_df.empty:
+        # 툴바: CSV 다운로드 + 한/영 토글 + 페이지네이션
+        csv_data = trades_df.copy()
+        csv_data['timestamp'] = csv_data['timestamp'].dt.strftime('%Y-%m-%d %H:%M:%S')
+        csv = csv_data.to_csv(index=False, encoding='utf-8-sig')
+
+        # 언어 토글 상태 초기화
+        if 'coin_translate_kr' not in st.session_state:
+            st.session_state.coin_translate_kr = False
+
+        # 거래금액 계산 (총자산 × 거래비율)
+        trades_df = trades_df.assign(trade_amount=(trades_df['krw_balance'] + trades_df['btc_balance'] * trades_df['btc_krw_price']) * trades_df['percentage'] / 100)
+
+        # 컬럼 순서: 시간/결정/%/출처/모델/거래금액/이유/BTC/가격
+        cols = ['timestamp', 'decision', 'percentage']
+        if 'source' in trades_df.columns:
+            cols.append('source')
+        if 'model' in trades_df.columns:
+            cols.append('model')
+        cols.append('trade_amount')
+        cols.append('reason')
+        cols.extend(['btc_balance', 'btc_krw_price'])
+
+        page_size = 15
+        total_records = len(trades_df)
+        total_pages = max(1, (total_records + page_size - 1) // page_size)
+
+        if 'coin_trades_page' not in st.session_state:
+            st.session_state.coin_trades_page = 1
+
+        # 컴팩트 툴바
+        tb1, tb2, tb3, tb4, tb5, tb6, tb7 = st.columns([1.5, 1.5, 0.8, 0.8, 1.2, 0.8, 0.8])
+        with tb1:
+            st.download_button("📥CSV", csv, f"coin_trades_{datetime.now().strftime('%Y%m%d')}.csv", "text/csv", key="coin_csv")
+        with tb2:
+            if st.button("🇰🇷한글" if not st.session_state.coin_translate_kr else "🇺🇸영어", key="coin_lang"):
+                st.session_state.coin_translate_kr = not st.session_state.coin_translate_kr
+                st.rerun(scope="fragment")
+        with tb3:
+            if st.button('◀', key='coin_prev'):
+                if st.session_state.coin_trades_page > 1:
+                    st.session_state.coin_trades_page -= 1
+                    st.rerun(scope="fragment")
+        with tb4:
+            if st.button('▶', key='coin_next'):
+                if st.session_state.coin_trades_page < total_pages:
+                    st.session_state.coin_trades_page += 1
+                    st.rerun(scope="fragment")
+        with tb5:
+            st.caption(f"{st.session_state.coin_trades_page}/{total_pages}")
+        with tb6:
+            if st.button('⏮', key='coin_first'):
+                st.session_state.coin_trades_page = 1
+                st.rerun(scope="fragment")
+        with tb7:
+            if st.button('⏭', key='coin_last'):
+                st.session_state.coin_trades_page = total_pages
+                st.rerun(scope="fragment")
+
+        start_idx = (st.session_state.coin_trades_page - 1) * page_size
+        end_idx = start_idx + page_size
+        page_data = trades_df.iloc[start_idx:end_idx].copy()
+
+        display = page_data[[c for c in cols if c in page_data.columns]].copy()
+        display['timestamp'] = display['timestamp'].dt.strftime('%m/%d %H:%M')
+        display['decision'] = display['decision'].map({'buy': '🟢매수', 'sell': '🔴매도', 'hold': '⚪홀드', 'partial_sell': '🟡부분매도'})
+
+        if 'source' in display.columns:
+            display['source'] = display['source'].map({'scheduled': '🕐정기', 'triggered': '⚡긴급', 'stop_loss': '🛑손절', 'take_profit': '💰익절'}).fillna('🕐정기')
+
+        if 'model' in display.columns:
+            def format_model(m):
+                if pd.isna(m) or not m:
+                    return "-"
+                if 'sonnet' in str(m).lower():
+                    return '🟣Sonnet'
+                if 'haiku' in str(m).lower():
+                    return '🟢Haiku'
+                if 'opus' in str(m).lower():
+                    return '🔴Opus'
+                return str(m)[:10]
+            display['model'] = display['model'].apply(format_model)
+
+        # 거래금액 포맷팅
+        if 'trade_amount' in display.columns:
+            display['trade_amount'] = display['trade_amount'].apply(lambda x: f"₩{x:,.0f}" if pd.notna(x) else "-")
+
+        # reason 포맷팅 (번역 토글에 따라) - 전체 텍스트 유지, 고유 문구만 한 번에 번역
+        reasons = display['reason'].fillna('').astype(str)
+        if st.session_state.coin_translate_kr:
+            reasons = reasons.map(translate_many_to_korean(reasons.unique()))
+        display['reason'] = reasons.replace('', '-')
+
+        display['btc_balance'] = display['btc_balance'].apply(lambda x: f"{x:.4f}")
+        display['btc_krw_price'] = display['btc_krw_price'].apply(lambda x: f"{x:,.0f}")
+
+        col_names = {'timestamp': '시간', 'decision': '결정', 'percentage': '%', 'source': '출처', 'model': '모델', 'trade_amount': '거래금액', 'reason': '이유', 'btc_balance': 'BTC', 'btc_krw_price': '가격'}
+        display.columns = [col_names.get(c, c) for c in display.columns]
+
+        # column_config로 이유 컬럼 넓게 표시 (클릭 시 전체 내용 표시)
+        st.dataframe(
+            display,
+            use_container_width=True,
+            hide_index=True,
+            height=400,
+            column_config={
+                "이유": st.column_config.TextColumn(
+                    "이유",
+                    width="large",
+                    help="클릭하면 전체 내용을 볼 수 있습니다"
+                )
+            }
+        )
+
 def render_coin_dashboard(days, chart_start_date):
     """코인 대시보드 렌더링"""
     trades_df = get_trades_from_supabase(days)
@@ -1149,7 +1417,8 @@ def render_coin_dashboard(days, chart_start_date):
         return
 
     perf = calculate_performance(trades_df, deposits_df, expenses_df, btc_price, days, trading_fees)
-    latest = trades_df.iloc[0]
+    # 최신 행은 dict로 한 번만 꺼내서 재사용 (Series 인덱싱 반복 방지)
+    latest = trades_df.iloc[0].to_dict()
     btc_val = latest['btc_balance'] * (btc_price or latest['btc_krw_price'])
     total_asset = latest['krw_balance'] + btc_val
 
@@ -1179,8 +1448,8 @@ def render_coin_dashboard(days, chart_start_date):
     c5.metric("순수익", f"₩{format_krw(perf.get('net_profit', 0))}", f"{perf.get('net_rate', 0):+.2f}%",
               help="실질수익 - 운영비용\n\n모든 비용을 제외한 최종 수익")
 
-    # 거래 성과 (승률, 평균수익)
-    trade_stats = calculate_trade_stats(trades_df)
+    # 거래 성과 (승률, 평균수익) - 위젯 조작으로 인한 재실행 시에는 캐시 사용
+    trade_stats, model_stats, hourly_stats = get_trade_analytics(days)
     st.markdown("#### 거래 성과")
     c1, c2, c3, c4, c5 = st.columns(5)
     c1.metric("승률", f"{trade_stats['win_rate']:.1f}%",
@@ -1199,161 +1468,43 @@ def render_coin_dashboard(days, chart_start_date):
     c1, c2 = st.columns(2)
     with c1:
         st.caption(f"📈 자산 증감 ({chart_start_date} 이후)", help="시간에 따른 총 자산(KRW+BTC) 변화\n\nBTC는 현재 시세로 환산")
-        st.plotly_chart(create_asset_chart(trades_df, deposits_df, btc_price, chart_start_date), use_container_width=True, config={'displayModeBar': False})
+        st.plotly_chart(create_asset_chart(trades_df, deposits_df, btc_price, chart_start_date), use_container_width=True, config={'displayModeBar': False}, key="coin_asset_chart")
     with c2:
         st.caption(f"📊 실질 수익 추이 ({chart_start_date} 이후)", help="총 자산 - 순입금 = 실질 수익\n\n0 이상이면 수익, 이하면 손실")
-        st.plotly_chart(create_profit_chart(trades_df, deposits_df, btc_price, chart_start_date), use_container_width=True, config={'displayModeBar': False})
+        st.plotly_chart(create_profit_chart(trades_df, deposits_df, btc_price, chart_start_date), use_container_width=True, config={'displayModeBar': False}, key="coin_profit_chart")
 
     # 벤치마크 비교 차트
     btc_history = get_btc_history(days)
     c1, c2 = st.columns(2)
     with c1:
         st.caption("📊 포트폴리오 vs BTC", help="포트폴리오 수익률과 BTC 단순보유(Buy & Hold) 수익률 비교\n\n포트폴리오가 위에 있으면 BTC보다 좋은 성과")
-        st.plotly_chart(create_benchmark_chart(trades_df, btc_history, deposits_df, btc_price), use_container_width=True, config={'displayModeBar': False})
+        st.plotly_chart(create_benchmark_chart(trades_df, btc_history, deposits_df, btc_price), use_container_width=True, config={'displayModeBar': False}, key="coin_benchmark_chart")
     with c2:
         st.caption("🪙 BTC 보유량", help="시간에 따른 비트코인 보유량 변화\n\n매수 시 증가, 매도 시 감소")
-        st.plotly_chart(create_btc_chart(trades_df), use_container_width=True, config={'displayModeBar': False})
+        st.plotly_chart(create_btc_chart(trades_df), use_container_width=True, config={'displayModeBar': False}, key="coin_btc_chart")
 
     c1, c2, c3 = st.columns(3)
     with c1:
         st.caption("🎯 거래 결정", help="AI 매매 결정 비율\n\n매수/매도/홀드 비율을 파이차트로 표시")
-        st.plotly_chart(create_decision_chart(trades_df), use_container_width=True, config={'displayModeBar': False})
+        st.plotly_chart(create_decision_chart(trades_df), use_container_width=True, config={'displayModeBar': False}, key="coin_decision_chart")
     with c2:
         st.caption("💸 비용 분포", help="운영 비용 카테고리별 비율\n\nAPI: Claude/OpenAI 등\n서버: EC2/Railway 등\n기타: 수수료 등")
-        st.plotly_chart(create_expense_chart(perf.get('expenses_by_cat', {})), use_container_width=True, config={'displayModeBar': False})
+        st.plotly_chart(create_expense_chart(perf.get('expenses_by_cat', {})), use_container_width=True, config={'displayModeBar': False}, key="coin_expense_chart")
     with c3:
-        model_stats = calculate_model_performance(trades_df)
         st.caption("🤖 모델별 성과", help="AI 모델별 총 손익 및 승률\n\n막대: 총 손익 (녹색=수익, 빨강=손실)\n숫자: 승률(%)")
-        st.plotly_chart(create_model_chart(model_stats), use_container_width=True, config={'displayModeBar': False})
+        st.plotly_chart(create_model_chart(model_stats), use_container_width=True, config={'displayModeBar': False}, key="coin_model_chart")
 
     # 시간대별 성과
-    hourly_stats = calculate_hourly_performance(trades_df)
     if not hourly_stats.empty:
         st.caption("⏰ 시간대별 성과 (KST)", help="각 시간대의 총 손익\n\n막대 위 숫자: 해당 시간대 거래 횟수\n녹색: 수익, 빨강: 손실")
-        st.plotly_chart(create_hourly_chart(hourly_stats), use_container_width=True, config={'displayModeBar': False})
+        st.plotly_chart(create_hourly_chart(hourly_stats), use_container_width=True, config={'displayModeBar': False}, key="coin_hourly_chart")
 
     # 기록 탭
     st.markdown("#### 기록")
     tab1, tab2, tab3, tab4 = st.tabs(["거래", "체결내역", "입출금", "비용"])
 
     with tab1:
-        if not trades_df.empty:
-            # 툴바: CSV 다운로드 + 한/영 토글 + 페이지네이션
-            csv_data = trades_df.copy()
-            csv_data['timestamp'] = csv_data['timestamp'].dt.strftime('%Y-%m-%d %H:%M:%S')
-            csv = csv_data.to_csv(index=False, encoding='utf-8-sig')
-
-            # 언어 토글 상태 초기화
-            if 'coin_translate_kr' not in st.session_state:
-                st.session_state.coin_translate_kr = False
-
-            # 거래금액 계산 (총자산 × 거래비율)
-            trades_df['trade_amount'] = (trades_df['krw_balance'] + trades_df['btc_balance'] * trades_df['btc_krw_price']) * trades_df['percentage'] / 100
-
-            # 컬럼 순서: 시간/결정/%/출처/모델/거래금액/이유/BTC/가격
-            cols = ['timestamp', 'decision', 'percentage']
-            if 'source' in trades_df.columns:
-                cols.append('source')
-            if 'model' in trades_df.columns:
-                cols.append('model')
-            cols.append('trade_amount')
-            cols.append('reason')
-            cols.extend(['btc_balance', 'btc_krw_price'])
-
-            page_size = 15
-            total_records = len(trades_df)
-            total_pages = max(1, (total_records + page_size - 1) // page_size)
-
-            if 'coin_trades_page' not in st.session_state:
-                st.session_state.coin_trades_page = 1
-
-            # 컴팩트 툴바
-            tb1, tb2, tb3, tb4, tb5, tb6, tb7 = st.columns([1.5, 1.5, 0.8, 0.8, 1.2, 0.8, 0.8])
-            with tb1:
-                st.download_button("📥CSV", csv, f"coin_trades_{datetime.now().strftime('%Y%m%d')}.csv", "text/csv", key="coin_csv")
-            with tb2:
-                if st.button("🇰🇷한글" if not st.session_state.coin_translate_kr else "🇺🇸영어", key="coin_lang"):
-                    st.session_state.coin_translate_kr = not st.session_state.coin_translate_kr
-                    st.rerun()
-            with tb3:
-                if st.button('◀', key='coin_prev'):
-                    if st.session_state.coin_trades_page > 1:
-                        st.session_state.coin_trades_page -= 1
-                        st.rerun()
-            with tb4:
-                if st.button('▶', key='coin_next'):
-                    if st.session_state.coin_trades_page < total_pages:
-                        st.session_state.coin_trades_page += 1
-                        st.rerun()
-            with tb5:
-                st.caption(f"{st.session_state.coin_trades_page}/{total_pages}")
-            with tb6:
-                if st.button('⏮', key='coin_first'):
-                    st.session_state.coin_trades_page = 1
-                    st.rerun()
-            with tb7:
-                if st.button('⏭', key='coin_last'):
-                    st.session_state.coin_trades_page = total_pages
-                    st.rerun()
-
-            start_idx = (st.session_state.coin_trades_page - 1) * page_size
-            end_idx = start_idx + page_size
-            page_data = trades_df.iloc[start_idx:end_idx].copy()
-
-            display = page_data[[c for c in cols if c in page_data.columns]].copy()
-            display['timestamp'] = display['timestamp'].dt.strftime('%m/%d %H:%M')
-            display['decision'] = display['decision'].map({'buy': '🟢매수', 'sell': '🔴매도', 'hold': '⚪홀드', 'partial_sell': '🟡부분매도'})
-
-            if 'source' in display.columns:
-                display['source'] = display['source'].map({'scheduled': '🕐정기', 'triggered': '⚡긴급', 'stop_loss': '🛑손절', 'take_profit': '💰익절'}).fillna('🕐정기')
-
-            if 'model' in display.columns:
-                def format_model(m):
-                    if pd.isna(m) or not m:
-                        return "-"
-                    if 'sonnet' in str(m).lower():
-                        return '🟣Sonnet'
-                    if 'haiku' in str(m).lower():
-                        return '🟢Haiku'
-                    if 'opus' in str(m).lower():
-                        return '🔴Opus'
-                    return str(m)[:10]
-                display['model'] = display['model'].apply(format_model)
-
-            # 거래금액 포맷팅
-            if 'trade_amount' in display.columns:
-                display['trade_amount'] = display['trade_amount'].apply(lambda x: f"₩{x:,.0f}" if pd.notna(x) else "-")
-
-            # reason 포맷팅 (번역 토글에 따라) - 전체 텍스트 유지
-            def format_reason(x):
-                if pd.isna(x) or not x:
-                    return "-"
-                text = str(x)
-                if st.session_state.coin_translate_kr:
-                    return translate_to_korean(text)
-                return text
-            display['reason'] = display['reason'].apply(format_reason)
-
-            display['btc_balance'] = display['btc_balance'].apply(lambda x: f"{x:.4f}")
-            display['btc_krw_price'] = display['btc_krw_price'].apply(lambda x: f"{x:,.0f}")
-
-            col_names = {'timestamp': '시간', 'decision': '결정', 'percentage': '%', 'source': '출처', 'model': '모델', 'trade_amount': '거래금액', 'reason': '이유', 'btc_balance': 'BTC', 'btc_krw_price': '가격'}
-            display.columns = [col_names.get(c, c) for c in display.columns]
-
-            # column_config로 이유 컬럼 넓게 표시 (클릭 시 전체 내용 표시)
-            st.dataframe(
-                display,
-                use_container_width=True,
-                hide_index=True,
-                height=400,
-                column_config={
-                    "이유": st.column_config.TextColumn(
-                        "이유",
-                        width="large",
-                        help="클릭하면 전체 내용을 볼 수 있습니다"
-                    )
-                }
-            )
+        render_coin_trades_table(trades_df)
 
     with tab2:
         if not orders_df.empty:
@@ -1397,6 +1548,112 @@ def render_coin_dashboard(days, chart_start_date):
 # 미국 주식 대시보드
 # ============================================================================
 
+@st.fragment
+def render_us_trades_table(trades_df):
+    """미국 주식 거래 기록 표 (페이지/언어 버튼은 이 부분만 다시 실행)"""
+    if not trades_df.empty:
+        # CSV 데이터 준비
+        csv_data = trades_df.copy()
+        csv_data['created_at'] = csv_data['created_at'].dt.strftime('%Y-%m-%d %H:%M:%S')
+        us_csv = csv_data.to_csv(index=False, encoding='utf-8-sig')
+
+        # 언어 토글 상태 초기화
+        if 'us_translate_kr' not in st.session_state:
+            st.session_state.us_translate_kr = False
+
+        page_size = 15
+        total_records = len(trades_df)
+        total_pages = max(1, (total_records + page_size - 1) // page_size)
+
+        if 'us_trades_page' not in st.session_state:
+            st.session_state.us_trades_page = 1
+
+        # 컴팩트 툴바
+        tb1, tb2, tb3, tb4, tb5, tb6, tb7 = st.columns([1.5, 1.5, 0.8, 0.8, 1.2, 0.8, 0.8])
+        with tb1:
+            st.download_button("📥CSV", us_csv, f"us_stock_trades_{datetime.now().strftime('%Y%m%d')}.csv", "text/csv", key="us_csv")
+        with tb2:
+            if st.button("🇰🇷한글" if not st.session_state.us_translate_kr else "🇺🇸영어", key="us_lang"):
+                st.session_state.us_translate_kr = not st.session_state.us_translate_kr
+                st.rerun(scope="fragment")
+        with tb3:
+            if st.button('◀', key='us_prev'):
+                if st.session_state.us_trades_page > 1:
+                    st.session_state.us_trades_page -= 1
+                    st.rerun(scope="fragment")
+        with tb4:
+            if st.button('▶', key='us_next'):
+                if st.session_state.us_trades_page < total_pages:
+                    st.session_state.us_trades_page += 1
+                    st.rerun(scope="fragment")
+        with tb5:
+            st.caption(f"{st.session_state.us_trades_page}/{total_pages}")
+        with tb6:
+            if st.button('⏮', key='us_first'):
+                st.session_state.us_trades_page = 1
+                st.rerun(scope="fragment")
+        with tb7:
+            if st.button('⏭', key='us_last'):
+                st.session_state.us_trades_page = total_pages
+                st.rerun(scope="fragment")
+
+        start_idx = (st.session_state.us_trades_page - 1) * page_size
+        end_idx = start_idx + page_size
+        page_data = trades_df.iloc[start_idx:end_idx].copy()
+
+        # 컬럼 선택
+        display_cols = ['created_at', 'symbol', 'action', 'quantity', 'price', 'amount']
+        if 'pnl' in page_data.columns:
+            display_cols.append('pnl')
+        if 'model' in page_data.columns:
+            display_cols.append('model')
+        if 'key_reasons' in page_data.columns:
+            display_cols.append('key_reasons')
+
+        display = page_data[[c for c in display_cols if c in page_data.columns]].copy()
+        display['created_at'] = display['created_at'].dt.strftime('%m/%d %H:%M')
+
+        if 'action' in display.columns:
+            display['action'] = display['action'].map({'buy': '🟢매수', 'sell': '🔴매도', 'stop_loss': '🛑손절', 'take_profit': '💰익절'})
+
+        if 'price' in display.columns:
+            display['price'] = display['price'].apply(lambda x: f"${x:.2f}" if pd.notna(x) else "-")
+        if 'amount' in display.columns:
+            display['amount'] = display['amount'].apply(lambda x: f"${x:,.2f}" if pd.notna(x) else "-")
+        if 'pnl' in display.columns:
+            display['pnl'] = display['pnl'].apply(lambda x: f"${x:+.2f}" if pd.notna(x) else "-")
+
+        if 'model' in display.columns:
+            def format_model(m):
+                if pd.isna(m) or not m:
+                    return "-"
+                if 'sonnet' in str(m).lower():
+                    return '🟣Sonnet'
+                if 'haiku' in str(m).lower():
+                    return '🟢Haiku'
+                return str(m)[:10]
+            display['model'] = display['model'].apply(format_model)
+
+        # key_reasons 포맷팅 (번역 토글에 따라) - 전체 텍스트 유지
+        if 'key_reasons' in display.columns:
+            # 리스트는 해시할 수 없으므로 행별로 문자열화한 뒤 고유 문구만 한 번에 번역
+            reasons = display['key_reasons'].apply(lambda x: " | ".join(x) if isinstance(x, list) else ("" if pd.isna(x) else str(x)))
+            if st.session_state.us_translate_kr:
+                reasons = reasons.map(translate_many_to_korean(reasons.unique()))
+            display['key_reasons'] = reasons.replace('', '-')
+
+        col_names = {'created_at': '시간', 'symbol': '종목', 'action': '거래', 'quantity': '수량', 'price': '가격', 'amount': '금액', 'pnl': '손익', 'model': '모델', 'key_reasons': '이유'}
+        display.columns = [col_names.get(c, c) for c in display.columns]
+
+        # column_config로 이유 컬럼 넓게 표시
+        column_cfg = {}
+        if '이유' in display.columns:
+            column_cfg["이유"] = st.column_config.TextColumn("이유", width="large")
+
+        st.dataframe(display, use_container_width=True, hide_index=True, height=400, column_config=column_cfg if column_cfg else None)
+    else:
+        st.info("거래 기록이 없습니다.")
+
 def render_us_stock_dashboard(days):
     """미국 주식 대시보드 렌더링"""
 
@@ -1431,14 +1688,14 @@ def render_us_stock_dashboard(days):
     trades_df = get_us_stock_trades(days)
     deposits_df = get_us_stock_deposits()
 
-    # 실질 수익 계산
-    perf = calculate_us_stock_performance(portfolio_df, deposits_df, trades_df)
+    # 실질 수익 / 거래 통계 / 모델별 성과 (캐시)
+    perf, us_trade_stats, us_model_stats = get_us_analytics(days)
 
     # 포트폴리오 현황
     st.markdown("#### 포트폴리오 현황")
 
     if not portfolio_df.empty:
-        latest = portfolio_df.iloc[0]
+        latest = portfolio_df.iloc[0].to_dict()
 
         # 투자 성과 (입출금 반영)
         st.markdown("##### 투자 성과")
@@ -1467,7 +1724,6 @@ def render_us_stock_dashboard(days):
                   help="(현재가 - 평균단가) × 수량\n\n보유 종목 전체의 평가손익")
 
         # 거래 성과 (승률, 평균수익)
-        us_trade_stats = calculate_us_trade_stats(trades_df)
         if us_trade_stats['total_trades'] > 0:
             st.markdown("##### 거래 성과")
             c1, c2, c3, c4, c5 = st.columns(5)
@@ -1556,7 +1812,6 @@ def render_us_stock_dashboard(days):
         st.caption("📊 포트폴리오 vs S&P 500", help="포트폴리오 수익률과 S&P 500 수익률 비교\n\n포트폴리오가 위에 있으면 시장보다 좋은 성과")
         st.plotly_chart(create_us_benchmark_chart(portfolio_df, sp500_history), use_container_width=True, config={'displayModeBar': False}, key="us_benchmark_chart")
     with c2:
-        us_model_stats = calculate_us_model_performance(trades_df)
         st.caption("🤖 모델별 성과", help="AI 모델별 총 손익 및 승률\n\n막대: 총 손익 (녹색=수익, 빨강=손실)\n숫자: 승률(%)")
         st.plotly_chart(create_us_model_chart(us_model_stats), use_container_width=True, config={'displayModeBar': False}, key="us_model_chart")
 
@@ -1573,114 +1828,7 @@ def render_us_stock_dashboard(days):
     us_tab1, us_tab2 = st.tabs(["거래", "입출금"])
 
     with us_tab1:
-        if not trades_df.empty:
-            # CSV 데이터 준비
-            csv_data = trades_df.copy()
-            csv_data['created_at'] = csv_data['created_at'].dt.strftime('%Y-%m-%d %H:%M:%S')
-            us_csv = csv_data.to_csv(index=False, encoding='utf-8-sig')
-
-            # 언어 토글 상태 초기화
-            if 'us_translate_kr' not in st.session_state:
-                st.session_state.us_translate_kr = False
-
-            page_size = 15
-            total_records = len(trades_df)
-            total_pages = max(1, (total_records + page_size - 1) // page_size)
-
-            if 'us_trades_page' not in st.session_state:
-                st.session_state.us_trades_page = 1
-
-            # 컴팩트 툴바
-            tb1, tb2, tb3, tb4, tb5, tb6, tb7 = st.columns([1.5, 1.5, 0.8, 0.8, 1.2, 0.8, 0.8])
-            with tb1:
-                st.download_button("📥CSV", us_csv, f"us_stock_trades_{datetime.now().strftime('%Y%m%d')}.csv", "text/csv", key="us_csv")
-            with tb2:
-                if st.button("🇰🇷한글" if not st.session_state.us_translate_kr else "🇺🇸영어", key="us_lang"):
-                    st.session_state.us_translate_kr = not st.session_state.us_translate_kr
-                    st.rerun()
-            with tb3:
-                if st.button('◀', key='us_prev'):
-                    if st.session_state.us_trades_page > 1:
-                        st.session_state.us_trades_page -= 1
-                        st.rerun()
-            with tb4:
-                if st.button('▶', key='us_next'):
-                    if st.session_state.us_trades_page < total_pages:
-                        st.session_state.us_trades_page += 1
-                        st.rerun()
-            with tb5:
-                st.caption(f"{st.session_state.us_trades_page}/{total_pages}")
-            with tb6:
-                if st.button('⏮', key='us_first'):
-                    st.session_state.us_trades_page = 1
-                    st.rerun()
-            with tb7:
-                if st.button('⏭', key='us_last'):
-                    st.session_state.us_trades_page = total_pages
-                    st.rerun()
-
-            start_idx = (st.session_state.us_trades_page - 1) * page_size
-            end_idx = start_idx + page_size
-            page_data = trades_df.iloc[start_idx:end_idx].copy()
-
-            # 컬럼 선택
-            display_cols = ['created_at', 'symbol', 'action', 'quantity', 'price', 'amount']
-            if 'pnl' in page_data.columns:
-                display_cols.append('pnl')
-            if 'model' in page_data.columns:
-                display_cols.append('model')
-            if 'key_reasons' in page_data.columns:
-                display_cols.append('key_reasons')
-
-            display = page_data[[c for c in display_cols if c in page_data.columns]].copy()
-            display['created_at'] = display['created_at'].dt.strftime('%m/%d %H:%M')
-
-            if 'action' in display.columns:
-                display['action'] = display['action'].map({'buy': '🟢매수', 'sell': '🔴매도', 'stop_loss': '🛑손절', 'take_profit': '💰익절'})
-
-            if 'price' in display.columns:
-                display['price'] = display['price'].apply(lambda x: f"${x:.2f}" if pd.notna(x) else "-")
-            if 'amount' in display.columns:
-                display['amount'] = display['amount'].apply(lambda x: f"${x:,.2f}" if pd.notna(x) else "-")
-            if 'pnl' in display.columns:
-                display['pnl'] = display['pnl'].apply(lambda x: f"${x:+.2f}" if pd.notna(x) else "-")
-
-            if 'model' in display.columns:
-                def format_model(m):
-                    if pd.isna(m) or not m:
-                        return "-"
-                    if 'sonnet' in str(m).lower():
-                        return '🟣Sonnet'
-                    if 'haiku' in str(m).lower():
-                        return '🟢Haiku'
-                    return str(m)[:10]
-                display['model'] = display['model'].apply(format_model)
-
-            # key_reasons 포맷팅 (번역 토글에 따라) - 전체 텍스트 유지
-            if 'key_reasons' in display.columns:
-                def format_reasons(x):
-                    if pd.isna(x) or not x:
-                        return "-"
-                    if isinstance(x, list):
-                        text = " | ".join(x)
-                    else:
-                        text = str(x)
-                    if st.session_state.us_translate_kr:
-                        return translate_to_korean(text)
-                    return text
-                display['key_reasons'] = display['key_reasons'].apply(format_reasons)
-
-            col_names = {'created_at': '시간', 'symbol': '종목', 'action': '거래', 'quantity': '수량', 'price': '가격', 'amount': '금액', 'pnl': '손익', 'model': '모델', 'key_reasons': '이유'}
-            display.columns = [col_names.get(c, c) for c in display.columns]
-
-            # column_config로 이유 컬럼 넓게 표시
-            column_cfg = {}
-            if '이유' in display.columns:
-                column_cfg["이유"] = st.column_config.TextColumn("이유", width="large")
-
-            st.dataframe(display, use_container_width=True, hide_index=True, height=400, column_config=column_cfg if column_cfg else None)
-        else:
-            st.info("거래 기록이 없습니다.")
+        render_us_trades_table(trades_df)
 
     with us_tab2:
         if not deposits_df.empty:
@@ -1694,8 +1842,10 @@ def render_us_stock_dashboard(days):
 
     # 푸터
     st.divider()
-    buy_count = len(trades_df[trades_df['action'] == 'buy']) if not trades_df.empty and 'action' in trades_df.columns else 0
-    sell_count = len(trades_df[trades_df['action'] == 'sell']) if not trades_df.empty and 'action' in trades_df.columns else 0
+    # 매수/매도 건수는 한 번의 집계로 (필터링한 복사본을 만들지 않음)
+    action_counts = trades_df['action'].value_counts() if 'action' in trades_df.columns else pd.Series(dtype='int64')
+    buy_count = int(action_counts.get('buy', 0))
+    sell_count = int(action_counts.get('sell', 0))
     st.caption(f"거래: {len(trades_df)}회 (매수 {buy_count} / 매도 {sell_count}) | 업데이트: {datetime.now(KST).strftime('%Y-%m-%d %H:%M')} KST")
 
 # ============================================================================
@@ -1,13 +1,31 @@
+import heapq
 import sqlite3
 import pandas as pd
 
+# 직전 행 대비 변화량을 돌려주는 SQLite 함수 (행을 읽는 순서대로 호출됨)
+def make_row_delta():
+    state = {'prev': None}
+    
+    def row_delta(value):
+        prev = state['prev']
+        state['prev'] = value
+        if prev is None or value is None:
+            return None
+        return value - prev
+    
+    return row_delta
+
 def check_database_structure():
     """데이터베이스 구조 및 입출금 내역 확인"""
     
     try:
-        conn = sqlite3.connect('bitcoin_trades.db')
+        # 조회만 하므로 읽기 전용으로 열기 (DB 파일이 없으면 빈 파일을 만들지 않고 오류)
+        conn = sqlite3.connect('file:bitcoin_trades.db?mode=ro', uri=True)
         cursor = conn.cursor()
         
+        # 읽기 전용 분석이므로 모든 조회를 하나의 읽기 트랜잭션에서 실행
+        cursor.execute("BEGIN")
+        
         print("=" * 60)
         print("🔍 데이터베이스 입출금 내역 확인")
         print("=" * 60)
@@ -52,7 +70,7 @@ def check_database_structure():
         
         # 3. 입출금 관련 컬럼 확인
         print("\n💰 3. 입출금 관련 컬럼 확인:")
-        existing_columns = [col[1] for col in columns_info]
+        existing_columns = {col[1] for col in columns_info}
         
         deposit_withdraw_columns = [
             'deposit_amount', 'withdraw_amount', 'cash_deposit', 
@@ -71,9 +89,15 @@ def check_database_structure():
         if found_columns:
             print(f"\n📊 4. 입출금 데이터 샘플 ({', '.join(found_columns)}):")
             
+            # 컬럼별 건수를 하나의 쿼리로 집계 (found_columns는 실제 테이블 컬럼만 포함)
+            count_query = " UNION ALL ".join(
+                f"SELECT '{col}', COUNT(*) FROM trades WHERE {col} IS NOT NULL AND {col} != 0"
+                for col in found_columns
+            )
+            counts = dict(cursor.execute(count_query).fetchall())
+            
             for col in found_columns:
-                cursor.execute(f"SELECT COUNT(*) FROM trades WHERE {col} IS NOT NULL AND {col} != 0")
-                count = cursor.fetchone()[0]
+                count = counts[col]
                 
                 if count > 0:
                     cursor.execute(f"SELECT {col}, timestamp FROM trades WHERE {col} IS NOT NULL AND {col} != 0 LIMIT 5")
@@ -87,45 +111,36 @@ def check_database_structure():
         else:
             print("\n❌ 입출금 관련 컬럼이 없습니다.")
         
-        # 5. KRW 잔액 변화 패턴 분석 (입출금 추정)
-        print("\n📈 5. KRW 잔액 변화 패턴 분석:")
+        # KRW 잔액 변화량은 id 순서로 한 번만 읽으면서 row_delta로 계산 (5, 6번 공용)
+        conn.create_function("row_delta", 1, make_row_delta())
         cursor.execute("""
-            SELECT 
-                timestamp, 
-                krw_balance,
-                LAG(krw_balance) OVER (ORDER BY timestamp) as prev_krw,
-                krw_balance - LAG(krw_balance) OVER (ORDER BY timestamp) as krw_change,
-                decision
+            SELECT timestamp, krw_balance, row_delta(krw_balance) as krw_change, decision
             FROM trades 
-            ORDER BY timestamp 
-            LIMIT 10
+            ORDER BY id
         """)
         
-        krw_changes = cursor.fetchall()
+        krw_changes = []
+        large_changes = []
+        for timestamp, krw_balance, change, decision in cursor:
+            if len(krw_changes) < 10:
+                krw_changes.append((timestamp, krw_balance, change, decision))
+            if change is not None and abs(change) > 100000 and decision not in ('buy', 'sell'):
+                large_changes.append((timestamp, change, decision, krw_balance))
+        
+        # 5. KRW 잔액 변화 패턴 분석 (입출금 추정)
+        print("\n📈 5. KRW 잔액 변화 패턴 분석:")
         print("   시간                     현재KRW      이전KRW      변화량       거래결정")
         print("-" * 85)
         
         for row in krw_changes:
-            timestamp, current_krw, prev_krw, change, decision = row
-            if prev_krw is not None:
+            timestamp, current_krw, change, decision = row
+            if change is not None:
+                prev_krw = current_krw - change
                 print(f"   {timestamp:<20} {current_krw:>10,.0f} {prev_krw:>10,.0f} {change:>10,.0f} {decision}")
         
         # 6. 큰 KRW 변화 감지 (입출금 가능성)
         print("\n🔍 6. 큰 KRW 변화 감지 (입출금 가능성):")
-        cursor.execute("""
-            SELECT 
-                timestamp,
-                krw_balance - LAG(krw_balance) OVER (ORDER BY timestamp) as krw_change,
-                decision,
-                krw_balance
-            FROM trades 
-            WHERE ABS(krw_balance - LAG(krw_balance) OVER (ORDER BY timestamp)) > 100000
-            AND decision NOT IN ('buy', 'sell')
-            ORDER BY ABS(krw_balance - LAG(krw_balance) OVER (ORDER BY timestamp)) DESC
-            LIMIT 10
-        """)
-        
-        large_changes = cursor.fetchall()
+        large_changes = heapq.nlargest(10, large_changes, key=lambda row: abs(row[1]))
         if large_changes:
             print("   시간                     KRW변화        거래결정    현재잔액")
             print("-" * 65)
@@ -1,5 +1,18 @@
 import sqlite3
-import pandas as pd
+from tabulate import tabulate
+
+# 삭제 대상 수동 입금 기록의 reason 패턴
+DELETE_REASON_PATTERNS = ('%Manual deposit%', '%수동%')
+
+# 조회용 수동 관련 기록 reason 패턴 (더 넓은 범위)
+MANUAL_REASON_PATTERNS = ('%Manual%', '%수동%', '%누락%', '%복구%')
+
+# reason LIKE 조건을 OR로 묶은 WHERE 절 (값은 파라미터로 전달)
+def reason_like_clause(patterns):
+    return " OR ".join(["reason LIKE ?"] * len(patterns))
+
+DELETE_WHERE = reason_like_clause(DELETE_REASON_PATTERNS)
+MANUAL_WHERE = reason_like_clause(MANUAL_REASON_PATTERNS)
 
 def delete_manual_deposit_records():
     """수동 입금 관련 모든 거래 내역 삭제"""
@@ -12,105 +25,68 @@ def delete_manual_deposit_records():
         print("🗑️  수동 입금 내역 삭제 작업")
         print("=" * 60)
         
-        # 1. 삭제 대상 확인
-        print("\n🔍 삭제 대상 확인:")
+        # 삭제와 전후 상태 확인을 한 트랜잭션으로 처리
+        cursor.execute("BEGIN IMMEDIATE")
         
-        # Manual deposit 관련 기록 찾기
-        cursor.execute("""
-            SELECT id, timestamp, reason, krw_balance,
-                   krw_balance - LAG(krw_balance) OVER (ORDER BY timestamp) as krw_change
-            FROM trades 
-            WHERE reason LIKE '%Manual deposit%' OR reason LIKE '%수동%'
-            ORDER BY timestamp DESC
-        """)
+        # 1. 삭제 전 상태
+        print(f"\n💾 삭제 전 상태:")
+        cursor.execute("SELECT krw_balance FROM trades WHERE id = (SELECT MAX(id) FROM trades)")
+        current_krw = cursor.fetchone()[0]
+        print(f"   현재 KRW 잔액: {current_krw:,}원")
         
-        manual_records = cursor.fetchall()
-        
-        if manual_records:
-            print("   발견된 수동 입금 기록:")
-            print(f"   {'ID':<5} {'시간':<25} {'KRW변화':<12} {'KRW잔액':<12} {'이유'}")
-            print("   " + "-" * 80)
-            
-            total_to_delete = 0
-            for record in manual_records:
-                id_val, timestamp, reason, krw_balance, krw_change = record
-                change_str = f"+{krw_change:,.0f}" if krw_change and krw_change > 0 else f"{krw_change:,.0f}" if krw_change else "0"
-                reason_short = (reason[:35] + "...") if reason and len(reason) > 35 else (reason or "")
-                print(f"   {id_val:<5} {timestamp:<25} {change_str:<12} {krw_balance:>12,.0f} {reason_short}")
-                total_to_delete += 1
-            
-            print(f"\n   📊 삭제될 기록 수: {total_to_delete}개")
-        else:
+        # 2. 삭제 실행 (삭제된 행을 RETURNING으로 바로 받음)
+        print(f"\n🗑️  삭제 실행 중...")
+        cursor.execute(f"""
+            DELETE FROM trades 
+            WHERE {DELETE_WHERE}
+            RETURNING id, timestamp, reason, krw_balance
+        """, DELETE_REASON_PATTERNS)
+        deleted_records = cursor.fetchall()
+        
+        if not deleted_records:
             print("   ❌ 삭제할 수동 입금 기록이 없습니다.")
+            conn.rollback()
             conn.close()
             return
         
-        # 2. 삭제 전 백업 정보
-        print(f"\n💾 삭제 전 상태:")
-        cursor.execute("SELECT COUNT(*) FROM trades")
-        total_before = cursor.fetchone()[0]
+        print("   삭제된 수동 입금 기록:")
+        print(f"   {'ID':<5} {'시간':<25} {'KRW잔액':<12} {'이유'}")
+        print("   " + "-" * 80)
         
-        cursor.execute("SELECT krw_balance FROM trades ORDER BY timestamp DESC LIMIT 1")
-        current_krw = cursor.fetchone()[0]
+        for id_val, timestamp, reason, krw_balance in sorted(deleted_records, key=lambda r: r[1] or "", reverse=True):
+            reason_short = (reason[:35] + "...") if reason and len(reason) > 35 else (reason or "")
+            print(f"   {id_val:<5} {timestamp:<25} {krw_balance:>12,.0f} {reason_short}")
         
-        print(f"   총 거래 기록: {total_before}개")
-        print(f"   현재 KRW 잔액: {current_krw:,}원")
+        print(f"\n   ✅ {len(deleted_records)}개 기록이 삭제되었습니다!")
         
-        # 3. 확인 메시지
-        print(f"\n⚠️  정말로 {total_to_delete}개의 수동 입금 기록을 삭제하시겠습니까?")
-        print("   이 작업은 되돌릴 수 없습니다!")
-        
-        # 스크립트에서는 자동 진행
-        confirm = "y"
-        print(f"   확인: {confirm}")
-        
-        if confirm.lower() in ['y', 'yes']:
-            # 4. 삭제 실행
-            print(f"\n🗑️  삭제 실행 중...")
-            
-            cursor.execute("""
-                DELETE FROM trades 
-                WHERE reason LIKE '%Manual deposit%' OR reason LIKE '%수동%'
-            """)
-            
-            deleted_count = cursor.rowcount
-            conn.commit()
-            
-            print(f"   ✅ {deleted_count}개 기록이 삭제되었습니다!")
-            
-            # 5. 삭제 후 상태 확인
-            print(f"\n📊 삭제 후 상태:")
-            cursor.execute("SELECT COUNT(*) FROM trades")
-            total_after = cursor.fetchone()[0]
-            
-            cursor.execute("SELECT krw_balance FROM trades ORDER BY timestamp DESC LIMIT 1")
-            new_krw = cursor.fetchone()[0]
-            
-            print(f"   총 거래 기록: {total_after}개 (이전: {total_before}개)")
-            print(f"   현재 KRW 잔액: {new_krw:,}원 (이전: {current_krw:,}원)")
-            print(f"   KRW 잔액 변화: {new_krw - current_krw:+,}원")
-            
-            # 6. 최근 거래 내역 확인
-            print(f"\n📋 삭제 후 최근 5개 거래:")
-            cursor.execute("""
-                SELECT timestamp, decision, reason, krw_balance
-                FROM trades 
-                ORDER BY timestamp DESC 
-                LIMIT 5
-            """)
-            
-            recent_trades = cursor.fetchall()
-            
-            print(f"   {'시간':<25} {'결정':<6} {'KRW잔액':<12} {'이유'}")
-            print("   " + "-" * 70)
-            
-            for trade in recent_trades:
-                timestamp, decision, reason, krw_balance = trade
-                reason_short = (reason[:35] + "...") if reason and len(reason) > 35 else (reason or "")
-                print(f"   {timestamp:<25} {decision:<6} {krw_balance:>12,.0f} {reason_short}")
-            
-        else:
-            print("❌ 삭제 작업이 취소되었습니다.")
+        # 3. 삭제 후 상태 확인
+        print(f"\n📊 삭제 후 상태:")
+        cursor.execute("SELECT krw_balance FROM trades WHERE id = (SELECT MAX(id) FROM trades)")
+        new_krw = cursor.fetchone()[0]
+        
+        print(f"   현재 KRW 잔액: {new_krw:,}원 (이전: {current_krw:,}원)")
+        print(f"   KRW 잔액 변화: {new_krw - current_krw:+,}원")
+        
+        # 4. 최근 거래 내역 확인
+        print(f"\n📋 삭제 후 최근 5개 거래:")
+        cursor.execute("""
+            SELECT timestamp, decision, reason, krw_balance
+            FROM trades 
+            ORDER BY timestamp DESC 
+            LIMIT 5
+        """)
+        
+        recent_trades = cursor.fetchall()
+        
+        print(f"   {'시간':<25} {'결정':<6} {'KRW잔액':<12} {'이유'}")
+        print("   " + "-" * 70)
+        
+        for trade in recent_trades:
+            timestamp, decision, reason, krw_balance = trade
+            reason_short = (reason[:35] + "...") if reason and len(reason) > 35 else (reason or "")
+            print(f"   {timestamp:<25} {decision:<6} {krw_balance:>12,.0f} {reason_short}")
+        
+        conn.commit()
         
         conn.close()
         
@@ -125,26 +101,30 @@ def delete_manual_deposit_records():
 def show_all_manual_records():
     """모든 수동 관련 기록 조회"""
     try:
-        conn = sqlite3.connect('bitcoin_trades.db')
+        # 조회만 하므로 읽기 전용으로 열기 (DB 파일이 없으면 빈 파일을 만들지 않고 오류)
+        conn = sqlite3.connect('file:bitcoin_trades.db?mode=ro', uri=True)
         
         print("\n🔍 모든 수동 관련 기록 조회:")
         
         # 더 넓은 범위로 검색
-        df = pd.read_sql_query("""
-            SELECT id, timestamp, decision, reason, krw_balance,
-                   krw_balance - LAG(krw_balance) OVER (ORDER BY timestamp) as krw_change
-            FROM trades 
-            WHERE reason LIKE '%Manual%' 
-               OR reason LIKE '%수동%'
-               OR reason LIKE '%누락%'
-               OR reason LIKE '%복구%'
-               OR ABS(krw_balance - LAG(krw_balance) OVER (ORDER BY timestamp)) = 500000
+        # 윈도우 함수는 WHERE에서 쓸 수 없으므로 CTE에서 변화량을 먼저 계산
+        cursor = conn.execute(f"""
+            WITH changes AS (
+                SELECT id, timestamp, decision, reason, krw_balance,
+                       krw_balance - LAG(krw_balance) OVER (ORDER BY timestamp) as krw_change
+                FROM trades
+            )
+            SELECT id, timestamp, decision, reason, krw_balance, krw_change
+            FROM changes 
+            WHERE {MANUAL_WHERE}
+               OR ABS(krw_change) = 500000
             ORDER BY timestamp DESC
-        """, conn)
+        """, MANUAL_REASON_PATTERNS)
+        rows = cursor.fetchall()
         
-        if len(df) > 0:
-            print(f"   발견된 의심 기록: {len(df)}개")
-            print(df.to_string(index=False))
+        if rows:
+            print(f"   발견된 의심 기록: {len(rows)}개")
+            print(tabulate(rows, headers=[col[0] for col in cursor.description], tablefmt='plain'))
         else:
             print("   관련 기록이 없습니다.")
         
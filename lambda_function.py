@@ -54,6 +54,9 @@ def log_trade(decision, percentage, reason, btc_balance, krw_balance, btc_avg_bu
     table.put_item(Item=item)
     logger.info(f"Trade logged: {decision}")
 
+# DynamoDB가 Decimal로 돌려주는 trades 숫자 컬럼
+TRADE_NUMERIC_COLUMNS = ['percentage', 'btc_balance', 'krw_balance', 'btc_avg_buy_price', 'btc_krw_price']
+
 # 최근 투자 기록 조회 (DynamoDB)
 def get_recent_trades(days=7):
     seven_days_ago = (datetime.now() - timedelta(days=days)).isoformat()
@@ -66,13 +69,10 @@ def get_recent_trades(days=7):
     if not items:
         return pd.DataFrame()
 
-    # Decimal을 float으로 변환
-    for item in items:
-        for key, value in item.items():
-            if isinstance(value, Decimal):
-                item[key] = float(value)
-
+    # Decimal로 오는 숫자 컬럼은 행별 변환 대신 컬럼 단위로 한 번에 float 변환
     df = pd.DataFrame(items)
+    numeric_cols = [col for col in TRADE_NUMERIC_COLUMNS if col in df.columns]
+    df[numeric_cols] = df[numeric_cols].astype(float)
     df = df.sort_values('timestamp', ascending=False)
     return df
 
@@ -131,16 +131,24 @@ def add_indicators(df):
 
     df['rsi'] = ta.momentum.RSIIndicator(close=df['close'], window=14).rsi()
 
-    macd = ta.trend.MACD(close=df['close'])
-    df['macd'] = macd.macd()
-    df['macd_signal'] = macd.macd_signal()
-    df['macd_diff'] = macd.macd_diff()
+    # EMA12/EMA26을 한 번씩만 계산해 MACD와 이동평균선에 함께 사용
+    ema_12 = df['close'].ewm(span=12, min_periods=12, adjust=False).mean()
+    ema_26 = df['close'].ewm(span=26, min_periods=26, adjust=False).mean()
+    df['macd'] = ema_12 - ema_26
+    df['macd_signal'] = df['macd'].ewm(span=9, min_periods=9, adjust=False).mean()
+    df['macd_diff'] = df['macd'] - df['macd_signal']
 
-    df['sma_20'] = ta.trend.SMAIndicator(close=df['close'], window=20).sma_indicator()
-    df['ema_12'] = ta.trend.EMAIndicator(close=df['close'], window=12).ema_indicator()
+    df['sma_20'] = df['bb_bbm']
+    df['ema_12'] = ema_12
 
     return df
 
+# 프롬프트용 OHLCV 직렬화 (행마다 dict를 만들지 않고 CSV 문자열로 한 번에 변환)
+def format_ohlcv_for_prompt(df, rows=None):
+    if rows:
+        df = df.tail(rows)
+    return df.to_csv()
+
 # 공포 탐욕 지수 조회
 def get_fear_and_greed_index():
     url = "https://api.alternative.me/fng/"
@@ -233,8 +241,8 @@ def ai_trading():
     current_market_data = {
         "fear_greed_index": fear_greed_index,
         "news_headlines": news_headlines,
-        "daily_ohlcv": df_daily.tail(5).to_dict(),
-        "hourly_ohlcv": df_hourly.tail(5).to_dict()
+        "daily_ohlcv": format_ohlcv_for_prompt(df_daily, rows=5),
+        "hourly_ohlcv": format_ohlcv_for_prompt(df_hourly, rows=5)
     }
 
     # 반성 생성
@@ -277,8 +285,8 @@ def ai_trading():
                 "role": "user",
                 "content": f"""Current investment status: {json.dumps(filtered_balances)}
                 Orderbook: {json.dumps(orderbook)}
-                Daily OHLCV with indicators (30 days): {df_daily.to_json()}
-                Hourly OHLCV with indicators (24 hours): {df_hourly.to_json()}
+                Daily OHLCV with indicators (30 days, CSV): {format_ohlcv_for_prompt(df_daily)}
+                Hourly OHLCV with indicators (24 hours, CSV): {format_ohlcv_for_prompt(df_hourly)}
                 Recent news headlines: {json.dumps(news_headlines)}
                 Fear and Greed Index: {json.dumps(fear_greed_index)}"""
             }
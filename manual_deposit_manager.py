@@ -1,27 +1,111 @@
+import argparse
+import json
 import sqlite3
+import sys
 import pandas as pd
 from datetime import datetime
 
-def add_manual_deposit(amount, date_str=None, description="수동 추가"):
-    """수동으로 입금 내역 추가 (안전한 기본값 사용)"""
+DB_PATH = 'bitcoin_trades.db'
+
+def open_db(db_path=DB_PATH):
+    """DB 연결 (WAL 모드와 캐시 설정 적용)"""
+    conn = sqlite3.connect(db_path)
+    conn.executescript("""
+        PRAGMA journal_mode=WAL;
+        PRAGMA synchronous=NORMAL;
+        PRAGMA temp_store=MEMORY;
+        PRAGMA cache_size=-65536;
+    """)
+    return conn
+
+# DB 경로별 trades 스키마 캐시 (컬럼명 목록, 컬럼명 → 인덱스, 컬럼별 기본값, INSERT 쿼리)
+_schema_cache = {}
+
+def default_for_type(col_type):
+    """컬럼 타입에 따른 기본값"""
+    col_type = col_type.upper()
+    if 'INTEGER' in col_type:
+        return 0
+    elif 'REAL' in col_type or 'FLOAT' in col_type:
+        return 0.0
+    elif 'TEXT' in col_type or 'VARCHAR' in col_type:
+        return ''
+    return None
+
+def get_schema(cursor, db_path=DB_PATH):
+    """trades 테이블 컬럼 정보 (처음 한 번만 PRAGMA 조회)"""
+    if db_path not in _schema_cache:
+        cursor.execute("PRAGMA table_info(trades)")
+        columns_info = cursor.fetchall()
+        columns = [col[1] for col in columns_info]
+        col_index = {name: i for i, name in enumerate(columns)}
+        # 타입별 기본값은 스키마를 읽을 때 한 번만 계산
+        col_defaults = {col[1]: default_for_type(col[2]) for col in columns_info}
+        # 같은 문자열 객체를 재사용해야 sqlite3 문장 캐시가 적중함
+        insert_sql = f"INSERT INTO trades ({', '.join(columns)}) VALUES ({', '.join(['?'] * len(columns))})"
+        _schema_cache[db_path] = (columns, col_index, col_defaults, insert_sql)
+    return _schema_cache[db_path]
+
+# 입금/출금별 표시 문구와 기록 형식
+MANUAL_ENTRY_KINDS = {
+    1: {
+        'icon': '💰', 'name': '입금', 'change': '증가액',
+        'reason': 'Manual deposit: {description}',
+        'reflection': 'Manual deposit of {amount:,} KRW added',
+    },
+    -1: {
+        'icon': '💸', 'name': '출금', 'change': '감소액',
+        'reason': 'Manual withdraw: {description}',
+        'reflection': 'Manual withdraw of {amount:,} KRW processed',
+    },
+}
+
+# 컬럼별 값 결정 규칙 (prev: 직전 거래 값, ctx: sign/amount/timestamp/description)
+# 여기에 없는 컬럼은 직전 값을 유지하고, 값이 없으면 타입별 기본값 사용
+MANUAL_FIELD_POLICY = {
+    'id': lambda prev, ctx: None,  # 자동 증가
+    'timestamp': lambda prev, ctx: ctx['timestamp'],
+    'decision': lambda prev, ctx: 'hold',  # 입출금은 보유 상태로
+    'percentage': lambda prev, ctx: 0,  # 거래가 아니므로 0
+    'reason': lambda prev, ctx: MANUAL_ENTRY_KINDS[ctx['sign']]['reason'].format(**ctx),
+    'btc_balance': lambda prev, ctx: prev,
+    'krw_balance': lambda prev, ctx: prev + ctx['sign'] * ctx['amount'],
+    'btc_avg_buy_price': lambda prev, ctx: prev,
+    'btc_krw_price': lambda prev, ctx: prev,
+    'reflection': lambda prev, ctx: MANUAL_ENTRY_KINDS[ctx['sign']]['reflection'].format(**ctx),
+}
+
+def build_manual_values(latest_trade, columns, col_defaults, ctx):
+    """직전 거래를 기준으로 입출금 레코드 값 생성 (컬럼명 → 값)"""
+    new_values = {}
+    for i, col_name in enumerate(columns):
+        policy = MANUAL_FIELD_POLICY.get(col_name)
+        if policy:
+            new_values[col_name] = policy(latest_trade[i], ctx)
+        else:
+            prev = latest_trade[i]
+            new_values[col_name] = prev if prev is not None else col_defaults[col_name]
+    return new_values
+
+def _add_manual_entry(sign, amount, date_str=None, description="수동 추가", verbose=True):
+    """수동 입금(sign=1)/출금(sign=-1) 내역 추가 (verbose=False면 결과 요약만 출력)"""
+    kind = MANUAL_ENTRY_KINDS[sign]
     
     try:
-        conn = sqlite3.connect('bitcoin_trades.db')
+        conn = open_db()
         cursor = conn.cursor()
         
         # 날짜 설정 (없으면 현재 시간)
-        if date_str:
-            timestamp = date_str
-        else:
-            timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        timestamp = date_str or datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         
-        print(f"💰 수동 입금 내역 추가 중...")
-        print(f"   금액: {amount:,}원")
-        print(f"   시간: {timestamp}")
-        print(f"   설명: {description}")
+        if verbose:
+            print(f"{kind['icon']} 수동 {kind['name']} 내역 추가 중...\n"
+                  f"   금액: {amount:,}원\n"
+                  f"   시간: {timestamp}\n"
+                  f"   설명: {description}")
         
         # 현재 최신 거래 정보 가져오기
-        cursor.execute("SELECT * FROM trades ORDER BY timestamp DESC LIMIT 1")
+        cursor.execute("SELECT * FROM trades WHERE id = (SELECT MAX(id) FROM trades)")
         latest_trade = cursor.fetchone()
         
         if not latest_trade:
@@ -29,193 +113,99 @@ def add_manual_deposit(amount, date_str=None, description="수동 추가"):
             return
         
         # 컬럼명 가져오기
-        cursor.execute("PRAGMA table_info(trades)")
-        columns_info = cursor.fetchall()
-        columns = [col[1] for col in columns_info]
+        columns, col_index, col_defaults, insert_sql = get_schema(cursor)
+        current_krw = latest_trade[col_index['krw_balance']]
         
-        print(f"\n📋 테이블 컬럼들: {columns}")
+        # 출금 전 잔액 확인
+        if sign < 0 and current_krw < amount:
+            print(f"⚠️  경고: 현재 KRW 잔액({current_krw:,}원)보다 출금액이 큽니다.")
+            confirm = input("계속 진행하시겠습니까? (y/n): ").strip().lower()
+            if confirm != 'y':
+                print("❌ 출금 추가가 취소되었습니다.")
+                return
         
         # 안전한 기본값으로 새 레코드 생성
-        new_values = {}
-        
-        for i, col_name in enumerate(columns):
-            if col_name == 'id':
-                # ID는 자동 증가이므로 None
-                new_values[col_name] = None
-                
-            elif col_name == 'timestamp':
-                # 입력된 시간 또는 현재 시간
-                new_values[col_name] = timestamp
-                
-            elif col_name == 'decision':
-                # 입금은 보유 상태로
-                new_values[col_name] = 'hold'
-                
-            elif col_name == 'percentage':
-                # 거래 비율은 0 (입금이므로 거래 아님)
-                new_values[col_name] = 0
-                
-            elif col_name == 'reason':
-                # 입금 이유
-                new_values[col_name] = f'Manual deposit: {description}'
-                
-            elif col_name == 'btc_balance':
-                # BTC 잔액은 그대로 유지
-                new_values[col_name] = latest_trade[i]
-                
-            elif col_name == 'krw_balance':
-                # KRW 잔액은 입금액만큼 증가
-                new_values[col_name] = latest_trade[i] + amount
-                
-            elif col_name == 'btc_avg_buy_price':
-                # 평균 매수가는 그대로 유지
-                new_values[col_name] = latest_trade[i]
-                
-            elif col_name == 'btc_krw_price':
-                # 현재 BTC 가격은 그대로 유지
-                new_values[col_name] = latest_trade[i]
-                
-            elif col_name == 'reflection':
-                # 거래 후 분석은 입금 관련 메모
-                new_values[col_name] = f'Manual deposit of {amount:,} KRW added'
-                
-            else:
-                # 기타 컬럼들은 이전 값 그대로 또는 적절한 기본값
-                if latest_trade[i] is not None:
-                    new_values[col_name] = latest_trade[i]
-                else:
-                    # 컬럼 타입에 따른 기본값
-                    col_type = columns_info[i][2].upper()
-                    if 'INTEGER' in col_type:
-                        new_values[col_name] = 0
-                    elif 'REAL' in col_type or 'FLOAT' in col_type:
-                        new_values[col_name] = 0.0
-                    elif 'TEXT' in col_type or 'VARCHAR' in col_type:
-                        new_values[col_name] = ''
-                    else:
-                        new_values[col_name] = None
+        ctx = {'sign': sign, 'amount': amount, 'timestamp': timestamp, 'description': description}
+        new_values = build_manual_values(latest_trade, columns, col_defaults, ctx)
         
-        # INSERT 쿼리 생성 및 실행
-        columns_str = ', '.join(columns)
-        placeholders = ', '.join(['?' for _ in columns])
+        # INSERT 실행 (캐시된 쿼리 사용)
         values_list = [new_values[col] for col in columns]
         
-        query = f"INSERT INTO trades ({columns_str}) VALUES ({placeholders})"
+        if verbose:
+            print("\n📊 삽입할 값들:\n" + "\n".join(f"   {col}: {val}" for col, val in new_values.items()))
         
-        print(f"\n🔧 실행할 쿼리: {query}")
-        print(f"📊 삽입할 값들:")
-        for col, val in new_values.items():
-            print(f"   {col}: {val}")
-        
-        cursor.execute(query, values_list)
+        cursor.execute(insert_sql, values_list)
         conn.commit()
         
-        print(f"\n✅ 입금 내역이 성공적으로 추가되었습니다!")
-        print(f"   이전 KRW 잔액: {latest_trade[columns.index('krw_balance')]:,}원")
-        print(f"   새로운 KRW 잔액: {new_values['krw_balance']:,}원")
-        print(f"   증가액: +{amount:,}원")
+        print(f"\n✅ {kind['name']} 내역이 성공적으로 추가되었습니다!\n"
+              f"   이전 KRW 잔액: {current_krw:,}원\n"
+              f"   새로운 KRW 잔액: {new_values['krw_balance']:,}원\n"
+              f"   {kind['change']}: {sign * amount:+,}원")
         
         conn.close()
         
+    except sqlite3.OperationalError as e:
+        # 스키마가 바뀌었을 수 있으므로 캐시를 비우고 다음 호출에서 다시 조회
+        _schema_cache.pop(DB_PATH, None)
+        print(f"❌ 오류 발생: {e}")
+        import traceback
+        traceback.print_exc()
     except Exception as e:
         print(f"❌ 오류 발생: {e}")
         import traceback
         traceback.print_exc()
 
-def add_manual_withdraw(amount, date_str=None, description="수동 추가"):
-    """수동으로 출금 내역 추가 (안전한 기본값 사용)"""
+def add_manual_deposit(amount, date_str=None, description="수동 추가", verbose=True):
+    """수동으로 입금 내역 추가"""
+    _add_manual_entry(1, amount, date_str, description, verbose)
+
+def add_manual_withdraw(amount, date_str=None, description="수동 추가", verbose=True):
+    """수동으로 출금 내역 추가"""
+    _add_manual_entry(-1, amount, date_str, description, verbose)
+
+def add_manual_deposits(entries):
+    """여러 건의 입금 내역을 한 트랜잭션으로 추가 (entries: [(금액, 날짜 또는 None, 설명), ...])"""
     
     try:
-        conn = sqlite3.connect('bitcoin_trades.db')
+        conn = open_db()
         cursor = conn.cursor()
+        cursor.execute("BEGIN IMMEDIATE")
         
-        if date_str:
-            timestamp = date_str
-        else:
-            timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        
-        print(f"💸 수동 출금 내역 추가 중...")
-        print(f"   금액: {amount:,}원")
-        print(f"   시간: {timestamp}")
-        print(f"   설명: {description}")
-        
-        cursor.execute("SELECT * FROM trades ORDER BY timestamp DESC LIMIT 1")
+        # 최신 거래는 한 번만 조회하고, 이후에는 직전에 만든 레코드를 기준으로 사용
+        cursor.execute("SELECT * FROM trades WHERE id = (SELECT MAX(id) FROM trades)")
         latest_trade = cursor.fetchone()
         
         if not latest_trade:
             print("❌ 기존 거래 데이터가 없습니다.")
+            conn.close()
             return
         
-        cursor.execute("PRAGMA table_info(trades)")
-        columns_info = cursor.fetchall()
-        columns = [col[1] for col in columns_info]
+        columns, col_index, col_defaults, insert_sql = get_schema(cursor)
+        start_krw = latest_trade[col_index['krw_balance']]
         
-        # 출금 전 잔액 확인
-        krw_balance_idx = columns.index('krw_balance')
-        current_krw = latest_trade[krw_balance_idx]
-        
-        if current_krw < amount:
-            print(f"⚠️  경고: 현재 KRW 잔액({current_krw:,}원)보다 출금액이 큽니다.")
-            confirm = input("계속 진행하시겠습니까? (y/n): ").strip().lower()
-            if confirm != 'y':
-                print("❌ 출금 추가가 취소되었습니다.")
-                return
-        
-        # 안전한 기본값으로 새 레코드 생성
-        new_values = {}
+        rows = []
+        for amount, date_str, description in entries:
+            timestamp = date_str or datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            ctx = {'sign': 1, 'amount': amount, 'timestamp': timestamp, 'description': description}
+            new_values = build_manual_values(latest_trade, columns, col_defaults, ctx)
+            latest_trade = [new_values[col] for col in columns]
+            rows.append(latest_trade)
         
-        for i, col_name in enumerate(columns):
-            if col_name == 'id':
-                new_values[col_name] = None
-            elif col_name == 'timestamp':
-                new_values[col_name] = timestamp
-            elif col_name == 'decision':
-                new_values[col_name] = 'hold'
-            elif col_name == 'percentage':
-                new_values[col_name] = 0
-            elif col_name == 'reason':
-                new_values[col_name] = f'Manual withdraw: {description}'
-            elif col_name == 'btc_balance':
-                new_values[col_name] = latest_trade[i]
-            elif col_name == 'krw_balance':
-                new_values[col_name] = latest_trade[i] - amount  # KRW 감소
-            elif col_name == 'btc_avg_buy_price':
-                new_values[col_name] = latest_trade[i]
-            elif col_name == 'btc_krw_price':
-                new_values[col_name] = latest_trade[i]
-            elif col_name == 'reflection':
-                new_values[col_name] = f'Manual withdraw of {amount:,} KRW processed'
-            else:
-                # 기타 컬럼들 안전 처리
-                if latest_trade[i] is not None:
-                    new_values[col_name] = latest_trade[i]
-                else:
-                    col_type = columns_info[i][2].upper()
-                    if 'INTEGER' in col_type:
-                        new_values[col_name] = 0
-                    elif 'REAL' in col_type or 'FLOAT' in col_type:
-                        new_values[col_name] = 0.0
-                    elif 'TEXT' in col_type:
-                        new_values[col_name] = ''
-                    else:
-                        new_values[col_name] = None
-        
-        # INSERT 실행
-        columns_str = ', '.join(columns)
-        placeholders = ', '.join(['?' for _ in columns])
-        values_list = [new_values[col] for col in columns]
-        
-        query = f"INSERT INTO trades ({columns_str}) VALUES ({placeholders})"
-        cursor.execute(query, values_list)
+        cursor.executemany(insert_sql, rows)
         conn.commit()
         
-        print(f"\n✅ 출금 내역이 성공적으로 추가되었습니다!")
-        print(f"   이전 KRW 잔액: {current_krw:,}원")
-        print(f"   새로운 KRW 잔액: {new_values['krw_balance']:,}원")
-        print(f"   감소액: -{amount:,}원")
+        # 건별 출력 없이 요약만 한 번 출력
+        print(f"✅ {len(rows)}건의 입금 내역이 추가되었습니다!\n"
+              f"   이전 KRW 잔액: {start_krw:,}원\n"
+              f"   새로운 KRW 잔액: {latest_trade[col_index['krw_balance']]:,}원")
         
         conn.close()
         
+    except sqlite3.OperationalError as e:
+        _schema_cache.pop(DB_PATH, None)
+        print(f"❌ 오류 발생: {e}")
+        import traceback
+        traceback.print_exc()
     except Exception as e:
         print(f"❌ 오류 발생: {e}")
         import traceback
@@ -224,17 +214,22 @@ def add_manual_withdraw(amount, date_str=None, description="수동 추가"):
 def show_recent_trades():
     """최근 거래 내역 확인"""
     try:
-        conn = sqlite3.connect('bitcoin_trades.db')
+        conn = open_db()
         
         print("\n📋 최근 10개 거래 내역:")
-        df = pd.read_sql_query("""
+        rows = conn.execute("""
             SELECT timestamp, decision, reason, btc_balance, krw_balance 
             FROM trades 
-            ORDER BY timestamp DESC 
+            ORDER BY id DESC 
             LIMIT 10
-        """, conn)
+        """).fetchall()
         
-        print(df.to_string(index=False))
+        # 10건 출력에는 DataFrame 없이 고정폭 포맷으로 충분
+        print(f"{'timestamp':20} {'decision':8} {'reason':40} {'btc_balance':>12} {'krw_balance':>14}")
+        print("\n".join(
+            f"{t or '':19.19}  {d or '':8} {r or '':40.40} {b or 0:12.6f} {k or 0:14,.0f}"
+            for t, d, r, b, k in rows
+        ))
         
         conn.close()
         
@@ -244,35 +239,41 @@ def show_recent_trades():
 def detect_missing_deposits():
     """누락된 입금 추정"""
     try:
-        conn = sqlite3.connect('bitcoin_trades.db')
+        conn = open_db()
         
         print("\n🔍 KRW 잔액 급증 구간 분석 (누락 입금 가능성):")
         
-        df = pd.read_sql_query("""
-            SELECT 
-                timestamp,
-                krw_balance,
-                LAG(krw_balance) OVER (ORDER BY timestamp) as prev_krw,
-                krw_balance - LAG(krw_balance) OVER (ORDER BY timestamp) as krw_change,
-                decision,
-                reason
-            FROM trades 
+        # 큰 KRW 증가 구간은 SQL에서 걸러서 후보 행만 가져옴
+        cursor = conn.execute("""
+            WITH deltas AS (
+                SELECT 
+                    timestamp,
+                    krw_balance,
+                    LAG(krw_balance) OVER (ORDER BY timestamp) as prev_krw,
+                    krw_balance - LAG(krw_balance) OVER (ORDER BY timestamp) as krw_change,
+                    decision,
+                    reason
+                FROM trades
+            )
+            SELECT timestamp, krw_balance, prev_krw, krw_change, decision, reason
+            FROM deltas
+            WHERE krw_change > 100000
+              AND decision NOT IN ('buy', 'sell')
             ORDER BY timestamp
-        """, conn)
-        
-        # 큰 KRW 증가 찾기
-        large_increases = df[
-            (df['krw_change'] > 100000) & 
-            (~df['decision'].isin(['buy', 'sell']))
-        ].copy()
+        """)
+        large_increases = pd.DataFrame.from_records(
+            cursor.fetchall(), columns=[d[0] for d in cursor.description]
+        ).astype({
+            'krw_balance': 'float64',
+            'prev_krw': 'float64',
+            'krw_change': 'float64'
+        })
         
         if len(large_increases) > 0:
             print("   의심스러운 KRW 증가 구간:")
-            print("   시간                     증가금액      결정    이유")
-            print("-" * 70)
-            
-            for _, row in large_increases.iterrows():
-                print(f"   {row['timestamp']:<20} +{row['krw_change']:>8,.0f}원   {row['decision']:<6} {row['reason']}")
+            output = large_increases[['timestamp', 'krw_change', 'decision', 'reason']]
+            output.columns = ['시간', '증가금액', '결정', '이유']
+            print(output.to_string(index=False, formatters={'증가금액': '+{:,.0f}원'.format}))
         else:
             print("   큰 KRW 증가 구간이 발견되지 않았습니다.")
         
@@ -281,55 +282,59 @@ def detect_missing_deposits():
     except Exception as e:
         print(f"❌ 오류: {e}")
 
-# 메인 실행 부분
-if __name__ == "__main__":
-    print("=" * 60)
-    print("💰 수동 입출금 내역 관리 도구")
-    print("=" * 60)
+def main():
+    parser = argparse.ArgumentParser(description='💰 수동 입출금 내역 관리 도구')
+    parser.add_argument('--quiet', action='store_true', help='입력값/삽입 값 상세 출력 생략')
     
-    while True:
-        print("\n📋 메뉴:")
-        print("1. 입금 내역 추가")
-        print("2. 출금 내역 추가")
-        print("3. 최근 거래 내역 확인")
-        print("4. 누락된 입금 추정")
-        print("5. 종료")
-        
-        choice = input("\n선택하세요 (1-5): ").strip()
-        
-        if choice == "1":
-            print("\n💰 입금 내역 추가")
-            amount = float(input("입금 금액을 입력하세요: "))
-            date_input = input("날짜 입력 (YYYY-MM-DD HH:MM:SS, 엔터시 현재시간): ").strip()
-            date_str = date_input if date_input else None
-            desc = input("설명 (선택사항): ").strip() or "수동 추가 입금"
-            
-            add_manual_deposit(amount, date_str, desc)
-            
-        elif choice == "2":
-            print("\n💸 출금 내역 추가")
-            amount = float(input("출금 금액을 입력하세요: "))
-            date_input = input("날짜 입력 (YYYY-MM-DD HH:MM:SS, 엔터시 현재시간): ").strip()
-            date_str = date_input if date_input else None
-            desc = input("설명 (선택사항): ").strip() or "수동 추가 출금"
-            
-            add_manual_withdraw(amount, date_str, desc)
-            
-        elif choice == "3":
-            show_recent_trades()
-            
-        elif choice == "4":
-            detect_missing_deposits()
-            
-        elif choice == "5":
-            print("👋 프로그램을 종료합니다.")
-            break
-            
-        else:
-            print("❌ 잘못된 선택입니다.")
+    subparsers = parser.add_subparsers(dest='command', help='명령')
+    
+    # deposit 명령
+    deposit_parser = subparsers.add_parser('deposit', help='입금 내역 추가')
+    deposit_parser.add_argument('amount', type=int, help='입금 금액')
+    deposit_parser.add_argument('--date', help='날짜 (YYYY-MM-DD HH:MM:SS, 생략시 현재시간)')
+    deposit_parser.add_argument('--desc', default='수동 추가 입금', help='설명')
+    
+    # deposit-bulk 명령 (stdin JSON: [{"amount": 100000, "date": "...", "desc": "..."}, ...])
+    subparsers.add_parser('deposit-bulk', help='stdin의 JSON 목록으로 여러 입금 내역을 한 번에 추가')
+    
+    # withdraw 명령
+    withdraw_parser = subparsers.add_parser('withdraw', help='출금 내역 추가')
+    withdraw_parser.add_argument('amount', type=int, help='출금 금액')
+    withdraw_parser.add_argument('--date', help='날짜 (YYYY-MM-DD HH:MM:SS, 생략시 현재시간)')
+    withdraw_parser.add_argument('--desc', default='수동 추가 출금', help='설명')
+    
+    # recent / detect 명령
+    subparsers.add_parser('recent', help='최근 거래 내역 확인')
+    subparsers.add_parser('detect', help='누락된 입금 추정')
+    
+    args = parser.parse_args()
+    
+    if not args.command:
+        parser.print_help()
+        return
+    
+    if args.command == 'deposit':
+        add_manual_deposit(args.amount, args.date, args.desc, verbose=not args.quiet)
+    
+    elif args.command == 'deposit-bulk':
+        try:
+            entries = [
+                (int(item['amount']), item.get('date'), item.get('desc', '수동 추가 입금'))
+                for item in json.load(sys.stdin)
+            ]
+        except (ValueError, KeyError, TypeError) as e:
+            print(f"❌ 입력 JSON 오류: {e}")
+            return
+        add_manual_deposits(entries)
+    
+    elif args.command == 'withdraw':
+        add_manual_withdraw(args.amount, args.date, args.desc, verbose=not args.quiet)
+    
+    elif args.command == 'recent':
+        show_recent_trades()
+    
+    elif args.command == 'detect':
+        detect_missing_deposits()
 
-    # 빠른 실행 (500,000원 입금 추가)
-    print("\n" + "="*60)
-    print("🚀 빠른 실행: 500,000원 입금 추가")
-    print("="*60)
-    add_manual_deposit(500000, None, "누락된 입금 복구")
\ No newline at end of file
+if __name__ == "__main__":
+    main()
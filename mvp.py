@@ -1,22 +1,35 @@
 import os
+import time
+from datetime import datetime, timezone
+from functools import lru_cache
+
+import orjson
+import pyupbit
 from dotenv import load_dotenv
+from openai import OpenAI
 
 
 load_dotenv()
 
+# OpenAI 클라이언트는 한 번만 만들어 HTTPS 연결을 재사용
+client = OpenAI()
+
+# 차트 데이터 캐시 단위 (초) - 10초 루프마다 업비트를 호출하지 않도록
+OHLCV_CACHE_SECONDS = 60
+
+# 업비트 30일 일봉 (같은 시간 구간 안에서는 캐시된 결과 재사용)
+@lru_cache(maxsize=1)
+def get_daily_ohlcv(time_bucket):
+    return pyupbit.get_ohlcv("KRW-BTC", count=30, interval="day")
+
 def ai_trading():
     # 업비트 차트 데이터 가져오기 (30일 일봉)
-    import pyupbit
-
-    df = pyupbit.get_ohlcv("KRW-BTC", count=30, interval="day")
+    now = datetime.now(timezone.utc).timestamp()
+    df = get_daily_ohlcv(int(now // OHLCV_CACHE_SECONDS))
     # print(df.tail())
     # print(df.to_json())
 
     # AI에게 데이터 제공하고 판단 받기
-
-    from openai import OpenAI
-    client = OpenAI()
-
     response = client.chat.completions.create(
     model="gpt-4o",
     messages=[
@@ -34,7 +47,7 @@ def ai_trading():
         "content": [
             {
             "type": "text",
-            "text": df.to_json()
+            "text": df.round(2).to_csv(lineterminator="\n")
             }
         ]
         }
@@ -52,11 +65,8 @@ def ai_trading():
 
     # AI의 판단에 따라 실제로 자동매매 진행하기
 
-    import json
-
-    result = json.loads(result)
+    result = orjson.loads(result)
 
-    import pyupbit
     access = os.getenv("UPBIT_ACCESS_KEY")
     secret = os.getenv("UPBIT_SECRET_KEY")
     upbit = pyupbit.Upbit(access, secret)
@@ -87,6 +97,5 @@ def ai_trading():
     # print(result["decision"])
 
 while True:
-    import time
     time.sleep(10)
     ai_trading()
@@ -2,6 +2,7 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
+from plotly.subplots import make_subplots
 import numpy as np
 import pyupbit
 import os
@@ -19,6 +20,23 @@ load_dotenv()
 
 UPBIT_FEE_RATE = 0.0005  # 업비트 수수료율 0.05%
 
+# Supabase trades에서 대시보드가 사용하는 컬럼
+TRADE_COLUMNS = "timestamp,decision,percentage,reason,btc_balance,krw_balance,btc_krw_price"
+
+# 거래 내역 테이블 숫자 포맷 (서버에서 문자열로 바꾸지 않고 브라우저에서 표시)
+UPBIT_TRADE_COLUMN_CONFIG = {
+    '체결가격': st.column_config.NumberColumn('체결가격 (원)', format='localized'),
+    '체결수량': st.column_config.NumberColumn('체결수량 (BTC)', format='%.6f'),
+    '수수료': st.column_config.NumberColumn('수수료 (원)', format='localized'),
+}
+AI_TRADE_COLUMN_CONFIG = {
+    'BTC 잔고': st.column_config.NumberColumn(format='%.6f'),
+    'KRW 잔고': st.column_config.NumberColumn('KRW 잔고 (원)', format='localized'),
+}
+
+# 자산/수익 차트에 그릴 최대 포인트 수 (넘으면 1시간 단위로 다운샘플링)
+MAX_CHART_POINTS = 500
+
 # ============================================================================
 # Supabase 연결
 # ============================================================================
@@ -42,7 +60,7 @@ def get_trades_from_supabase(start_date=None):
         return pd.DataFrame()
 
     try:
-        query = supabase.table("trades").select("*").order("timestamp", desc=True)
+        query = supabase.table("trades").select(TRADE_COLUMNS).order("timestamp", desc=True)
 
         if start_date:
             query = query.gte("timestamp", start_date.isoformat())
@@ -58,6 +76,35 @@ def get_trades_from_supabase(start_date=None):
         st.error(f"Supabase 조회 실패: {e}")
         return pd.DataFrame()
 
+@st.cache_data(ttl=60)
+def get_asset_history(start_date=None):
+    """자산/수익 추이 데이터 (시간순 정렬 + 총 자산/수익 계산을 한 번만 수행)"""
+    trades_df = get_trades_from_supabase(start_date)
+    if trades_df.empty:
+        return trades_df
+
+    # 조회 결과가 이미 최신순이므로 뒤집기만 하면 시간순
+    df = trades_df.iloc[::-1].reset_index(drop=True)
+    total_asset = df['krw_balance'] + df['btc_balance'] * df['btc_krw_price']
+    profit = total_asset - total_asset.iloc[0]
+    # 파생 컬럼은 assign 한 번으로 추가
+    return df.assign(
+        total_asset=total_asset,
+        profit=profit,
+        profit_pct=profit / total_asset.iloc[0] * 100
+    )
+
+@st.cache_data(ttl=60)
+def get_chart_history(start_date=None):
+    """차트용 자산/수익 추이 (포인트가 많으면 시간당 마지막 값만 사용, 시작점은 유지)"""
+    df = get_asset_history(start_date)
+    if len(df) <= MAX_CHART_POINTS:
+        return df
+
+    hourly = df.set_index('timestamp').resample('1h').last().dropna(subset=['total_asset']).reset_index()
+    # 시작 기준선이 실제 시작 자산과 일치하도록 첫 레코드는 그대로 포함
+    return pd.concat([df.iloc[:1], hourly[hourly['timestamp'] > df['timestamp'].iloc[0]]], ignore_index=True)
+
 # ============================================================================
 # 업비트 API 연결
 # ============================================================================
@@ -158,42 +205,48 @@ def get_current_balance():
 # 유틸리티 함수들
 # ============================================================================
 
+# 큰 수 축약 단위 (기준값, 접미사, 소수 자릿수) - 큰 단위부터 확인
+NUMBER_UNITS = ((1_000_000, 'M', 1), (1_000, 'K', 0))
+
 def format_number(value):
     """숫자 포맷팅"""
-    if pd.isna(value):
+    # 숫자는 변환/예외 처리 없이 바로 사용, 그 외(문자열 등)만 파싱 시도
+    if isinstance(value, (int, float)):
+        num = value
+    else:
+        if pd.isna(value):
+            return "0"
+        try:
+            num = float(value)
+        except (TypeError, ValueError):
+            return str(value)
+    if num != num:  # NaN
         return "0"
     
-    try:
-        num = float(value)
-        if abs(num) >= 1_000_000:
-            return f"{num/1_000_000:.1f}M"
-        elif abs(num) >= 1_000:
-            return f"{num/1_000:.0f}K"
-        elif 0 < abs(num) < 1:
-            return f"{num:.6f}"
-        else:
-            return f"{num:,.0f}"
-    except:
-        return str(value)
+    magnitude = abs(num)
+    for base, suffix, digits in NUMBER_UNITS:
+        if magnitude >= base:
+            return f"{num / base:.{digits}f}{suffix}"
+    if 0 < magnitude < 1:
+        return f"{num:.6f}"
+    return f"{num:,.0f}"
+
+SIDE_LABELS = {'bid': '매수', 'ask': '매도'}
+
+ORDER_TYPE_LABELS = {
+    'limit': '지정가',
+    'price': '시장가(매수)',
+    'market': '시장가(매도)',
+    'best': '최유리'
+}
 
 def format_side(side):
     """매수/매도 한글 변환"""
-    if side == 'bid':
-        return '매수'
-    elif side == 'ask':
-        return '매도'
-    else:
-        return side
+    return SIDE_LABELS.get(side, side)
 
 def format_order_type(ord_type):
     """주문 타입 한글 변환"""
-    type_map = {
-        'limit': '지정가',
-        'price': '시장가(매수)',
-        'market': '시장가(매도)',
-        'best': '최유리'
-    }
-    return type_map.get(ord_type, ord_type)
+    return ORDER_TYPE_LABELS.get(ord_type, ord_type)
 
 # ============================================================================
 # 데이터 분석 함수
@@ -220,8 +273,8 @@ def analyze_trading_performance(trades_df, current_balance):
     current_btc_value = current_balance['btc_value']
     current_krw = current_balance['krw_balance']
     
-    # 실현 손익 (매도한 것만)
-    realized_profit = total_sell_amount - (len(sell_trades) * current_balance['btc_avg_price'] * sell_trades['executed_volume'].mean() if not sell_trades.empty else 0)
+    # 실현 손익 (매도한 것만) - 매도 수량 × 평균 매수가를 원가로 차감
+    realized_profit = total_sell_amount - current_balance['btc_avg_price'] * sell_trades['executed_volume'].sum()
     
     # 미실현 손익 (현재 보유 BTC)
     if current_balance['btc_avg_price'] > 0:
@@ -259,7 +312,7 @@ def create_trading_timeline_chart(trades_df):
     # 매수 거래
     buy_trades = trades_df[trades_df['side'] == 'bid']
     if not buy_trades.empty:
-        fig.add_trace(go.Scatter(
+        fig.add_trace(go.Scattergl(
             x=buy_trades['created_at'],
             y=buy_trades['price'],
             mode='markers',
@@ -269,17 +322,18 @@ def create_trading_timeline_chart(trades_df):
                 size=buy_trades['executed_volume'] * 1000,  # 볼륨에 따른 크기
                 symbol='triangle-up',
                 sizemode='area',
-                sizeref=2.*max(buy_trades['executed_volume'])/50**2,
+                sizeref=2.*buy_trades['executed_volume'].max()/50**2,
                 sizemin=4
             ),
-            text=buy_trades.apply(lambda x: f"매수<br>가격: {x['price']:,.0f}원<br>수량: {x['executed_volume']:.6f} BTC", axis=1),
-            hovertemplate='%{text}<extra></extra>'
+            # 호버 문구는 행별 apply로 만들지 않고 수량만 넘겨 브라우저에서 포맷
+            customdata=buy_trades['executed_volume'],
+            hovertemplate='매수<br>가격: %{y:,.0f}원<br>수량: %{customdata:.6f} BTC<extra></extra>'
         ))
     
     # 매도 거래
     sell_trades = trades_df[trades_df['side'] == 'ask']
     if not sell_trades.empty:
-        fig.add_trace(go.Scatter(
+        fig.add_trace(go.Scattergl(
             x=sell_trades['created_at'],
             y=sell_trades['price'],
             mode='markers',
@@ -289,11 +343,12 @@ def create_trading_timeline_chart(trades_df):
                 size=sell_trades['executed_volume'] * 1000,
                 symbol='triangle-down',
                 sizemode='area',
-                sizeref=2.*max(sell_trades['executed_volume'])/50**2 if not sell_trades.empty else 1,
+                sizeref=2.*sell_trades['executed_volume'].max()/50**2 if not sell_trades.empty else 1,
                 sizemin=4
             ),
-            text=sell_trades.apply(lambda x: f"매도<br>가격: {x['price']:,.0f}원<br>수량: {x['executed_volume']:.6f} BTC", axis=1),
-            hovertemplate='%{text}<extra></extra>'
+            # 호버 문구는 행별 apply로 만들지 않고 수량만 넘겨 브라우저에서 포맷
+            customdata=sell_trades['executed_volume'],
+            hovertemplate='매도<br>가격: %{y:,.0f}원<br>수량: %{customdata:.6f} BTC<extra></extra>'
         ))
     
     # 현재 BTC 가격 라인
@@ -315,12 +370,10 @@ def create_volume_chart(trades_df):
     if trades_df.empty:
         return go.Figure()
 
-    # 일별 거래량 집계
-    trades_df['date'] = trades_df['created_at'].dt.date
-    daily_volume = trades_df.groupby(['date', 'side']).agg({
-        'executed_volume': 'sum',
-        'price': 'mean'
-    }).reset_index()
+    # 일별 거래량 집계 (입력 df에 컬럼을 추가하지 않고 날짜 Series로 바로 그룹화)
+    # dt.date는 행마다 파이썬 date 객체를 만드므로 datetime64 그대로 자정으로 내림
+    dates = trades_df['created_at'].dt.normalize().rename('date')
+    daily_volume = trades_df.groupby([dates, 'side'])['executed_volume'].sum().reset_index()
 
     fig = go.Figure()
 
@@ -356,20 +409,19 @@ def create_volume_chart(trades_df):
 
     return fig
 
-def create_asset_chart(trades_df):
-    """자산 증감 차트 (총 자산 = KRW + BTC*가격)"""
-    if trades_df.empty:
+def create_asset_profit_chart(df):
+    """자산 증감 + 실질 수익 차트 (x축을 공유하는 하나의 figure, get_asset_history 결과 사용)"""
+    if df.empty:
         return go.Figure()
 
-    # 시간순 정렬
-    df = trades_df.sort_values('timestamp').copy()
-
-    # 총 자산 계산
-    df['total_asset'] = df['krw_balance'] + df['btc_balance'] * df['btc_krw_price']
-
-    fig = go.Figure()
+    fig = make_subplots(
+        rows=2, cols=1,
+        shared_xaxes=True,
+        vertical_spacing=0.08,
+        subplot_titles=('자산 증감 추이', '실질 수익 추이 (시작점 대비)')
+    )
 
-    fig.add_trace(go.Scatter(
+    fig.add_trace(go.Scattergl(
         x=df['timestamp'],
         y=df['total_asset'],
         mode='lines+markers',
@@ -378,66 +430,39 @@ def create_asset_chart(trades_df):
         marker=dict(size=6),
         fill='tozeroy',
         fillcolor='rgba(46, 134, 171, 0.1)'
-    ))
+    ), row=1, col=1)
 
     # 시작점 기준선
-    if len(df) > 0:
-        initial_asset = df.iloc[0]['total_asset']
-        fig.add_hline(
-            y=initial_asset,
-            line_dash="dash",
-            line_color="gray",
-            annotation_text=f"시작: {initial_asset:,.0f}원"
-        )
-
-    fig.update_layout(
-        title='자산 증감 추이',
-        xaxis_title='시간',
-        yaxis_title='총 자산 (KRW)',
-        height=400,
-        yaxis=dict(tickformat=',')
-    )
-
-    return fig
-
-def create_profit_chart(trades_df):
-    """실질 수익 차트 (시작점 대비 수익/손실)"""
-    if trades_df.empty:
-        return go.Figure()
-
-    # 시간순 정렬
-    df = trades_df.sort_values('timestamp').copy()
-
-    # 총 자산 및 수익 계산
-    df['total_asset'] = df['krw_balance'] + df['btc_balance'] * df['btc_krw_price']
     initial_asset = df.iloc[0]['total_asset']
-    df['profit'] = df['total_asset'] - initial_asset
-    df['profit_pct'] = (df['profit'] / initial_asset) * 100
-
-    fig = go.Figure()
+    fig.add_hline(
+        y=initial_asset,
+        line_dash="dash",
+        line_color="gray",
+        annotation_text=f"시작: {initial_asset:,.0f}원",
+        row=1, col=1
+    )
 
-    # 색상: 수익이면 초록, 손실이면 빨강
-    colors = ['#00C853' if p >= 0 else '#FF1744' for p in df['profit']]
+    # 색상: 수익이면 초록, 손실이면 빨강 (행별 루프 대신 배열 한 번에 선택)
+    colors = np.where(df['profit'].to_numpy() >= 0, '#00C853', '#FF1744')
 
     fig.add_trace(go.Bar(
         x=df['timestamp'],
         y=df['profit'],
         name='실질 수익',
         marker_color=colors,
-        text=df['profit_pct'].apply(lambda x: f"{x:+.1f}%"),
+        # 수익률 라벨은 숫자 그대로 보내고 브라우저에서 포맷
+        text=df['profit_pct'],
+        texttemplate='%{text:+.1f}%',
         textposition='outside'
-    ))
+    ), row=2, col=1)
 
     # 0 기준선
-    fig.add_hline(y=0, line_color="black", line_width=1)
+    fig.add_hline(y=0, line_color="black", line_width=1, row=2, col=1)
 
-    fig.update_layout(
-        title='실질 수익 추이 (시작점 대비)',
-        xaxis_title='시간',
-        yaxis_title='수익/손실 (KRW)',
-        height=400,
-        yaxis=dict(tickformat=',')
-    )
+    fig.update_layout(height=700, showlegend=False)
+    fig.update_xaxes(title_text='시간', row=2, col=1)
+    fig.update_yaxes(title_text='총 자산 (KRW)', tickformat=',', row=1, col=1)
+    fig.update_yaxes(title_text='수익/손실 (KRW)', tickformat=',', row=2, col=1)
 
     return fig
 
@@ -578,25 +603,16 @@ def main():
     st.caption(f"시작일: {start_date} 이후 데이터")
 
     supabase_trades = get_trades_from_supabase(start_datetime)
+    asset_history = get_asset_history(start_datetime)
 
     if not supabase_trades.empty:
-        col1, col2 = st.columns(2)
-
-        with col1:
-            asset_chart = create_asset_chart(supabase_trades)
-            st.plotly_chart(asset_chart, use_container_width=True)
-
-        with col2:
-            profit_chart = create_profit_chart(supabase_trades)
-            st.plotly_chart(profit_chart, use_container_width=True)
+        asset_profit_chart = create_asset_profit_chart(get_chart_history(start_datetime))
+        st.plotly_chart(asset_profit_chart, use_container_width=True)
 
         # 요약 통계
-        if len(supabase_trades) > 1:
-            first_record = supabase_trades.sort_values('timestamp').iloc[0]
-            last_record = supabase_trades.sort_values('timestamp').iloc[-1]
-
-            initial_asset = first_record['krw_balance'] + first_record['btc_balance'] * first_record['btc_krw_price']
-            final_asset = last_record['krw_balance'] + last_record['btc_balance'] * last_record['btc_krw_price']
+        if len(asset_history) > 1:
+            initial_asset = asset_history['total_asset'].iloc[0]
+            final_asset = asset_history['total_asset'].iloc[-1]
             total_profit = final_asset - initial_asset
             profit_pct = (total_profit / initial_asset) * 100 if initial_asset > 0 else 0
 
@@ -624,12 +640,9 @@ def main():
             # 컬럼명 한글화
             display_df.columns = ['거래시간', '구분', '주문타입', '체결가격', '체결수량', '수수료', '상태']
 
-            # 데이터 포맷팅
-            display_df['구분'] = display_df['구분'].apply(format_side)
-            display_df['주문타입'] = display_df['주문타입'].apply(format_order_type)
-            display_df['체결가격'] = display_df['체결가격'].apply(lambda x: f"{x:,.0f}원")
-            display_df['체결수량'] = display_df['체결수량'].apply(lambda x: f"{x:.6f} BTC")
-            display_df['수수료'] = display_df['수수료'].apply(lambda x: f"{x:,.0f}원")
+            # 라벨만 dict 매핑으로 변환 (숫자 컬럼은 column_config로 표시 포맷 지정)
+            display_df['구분'] = display_df['구분'].map(SIDE_LABELS).fillna(display_df['구분'])
+            display_df['주문타입'] = display_df['주문타입'].map(ORDER_TYPE_LABELS).fillna(display_df['주문타입'])
 
             # 페이지네이션
             page_size = 20
@@ -658,7 +671,7 @@ def main():
 
             start_idx = (st.session_state.upbit_page - 1) * page_size
             end_idx = start_idx + page_size
-            st.dataframe(display_df.iloc[start_idx:end_idx], use_container_width=True)
+            st.dataframe(display_df.iloc[start_idx:end_idx], use_container_width=True, column_config=UPBIT_TRADE_COLUMN_CONFIG)
         else:
             st.dataframe(trades_df.head(20), use_container_width=True)
     
@@ -701,7 +714,7 @@ def main():
 
             ai_start_idx = (st.session_state.ai_page - 1) * ai_page_size
             ai_end_idx = ai_start_idx + ai_page_size
-            st.dataframe(ai_display_df.iloc[ai_start_idx:ai_end_idx], use_container_width=True)
+            st.dataframe(ai_display_df.iloc[ai_start_idx:ai_end_idx], use_container_width=True, column_config=AI_TRADE_COLUMN_CONFIG)
         else:
             st.info("AI 트레이딩 기록이 없습니다.")
     
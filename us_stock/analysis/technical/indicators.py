@@ -338,27 +338,20 @@ class TechnicalAnalyzer:
     def _find_support_resistance(self, df: pd.DataFrame, lookback: int = 60) -> Tuple[List[float], List[float]]:
         """지지/저항 레벨 찾기"""
         recent = df.tail(lookback)
-        high = recent['high']
-        low = recent['low']
-        close = recent['close']
-
-        current_price = close.iloc[-1]
-
-        # 로컬 최저점 (지지)
-        supports = []
-        for i in range(2, len(low) - 2):
-            if low.iloc[i] < low.iloc[i-1] and low.iloc[i] < low.iloc[i-2] and \
-               low.iloc[i] < low.iloc[i+1] and low.iloc[i] < low.iloc[i+2]:
-                if low.iloc[i] < current_price:
-                    supports.append(low.iloc[i])
-
-        # 로컬 최고점 (저항)
-        resistances = []
-        for i in range(2, len(high) - 2):
-            if high.iloc[i] > high.iloc[i-1] and high.iloc[i] > high.iloc[i-2] and \
-               high.iloc[i] > high.iloc[i+1] and high.iloc[i] > high.iloc[i+2]:
-                if high.iloc[i] > current_price:
-                    resistances.append(high.iloc[i])
+        high = recent['high'].to_numpy()
+        low = recent['low'].to_numpy()
+
+        current_price = recent['close'].iloc[-1]
+
+        # 로컬 최저점 (지지): 앞뒤 2개 봉보다 낮은 저가
+        mid = low[2:-2]
+        is_trough = (mid < low[1:-3]) & (mid < low[:-4]) & (mid < low[3:-1]) & (mid < low[4:])
+        supports = mid[is_trough & (mid < current_price)].tolist()
+
+        # 로컬 최고점 (저항): 앞뒤 2개 봉보다 높은 고가
+        mid = high[2:-2]
+        is_peak = (mid > high[1:-3]) & (mid > high[:-4]) & (mid > high[3:-1]) & (mid > high[4:])
+        resistances = mid[is_peak & (mid > current_price)].tolist()
 
         # 가장 가까운 순으로 정렬
         supports = sorted(set(supports), reverse=True)[:3]